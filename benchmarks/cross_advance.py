@@ -0,0 +1,62 @@
+"""
+Measures the latency of `CoverCross.advance()` as the cardinality of the cross
+grows.
+
+Each size is a cross of `CoverRange` nets with one bin per value, so the number
+of combinations is the product of the ranges' lengths. The time reported is the
+average over `advance(rand=True)` calls, which pick random combinations across the
+whole cross.
+"""
+
+import argparse
+import time
+
+import cocotb
+# build coverage nets without a running simulator
+cocotb.top = None
+
+from verb.coverage import Coverage, CoverCross, CoverRange
+
+
+SIZES = [
+    (8, 8),
+    (16, 16),
+    (32, 32),
+    (64, 64),
+    (64, 64, 16),
+    (128, 128, 16),
+]
+
+
+def measure(dims: tuple, calls: int) -> float:
+    """
+    Returns the average number of microseconds per `advance()` call on a cross of
+    ranges with the lengths in `dims`.
+    """
+    Coverage.reset()
+    nets = [CoverRange('r'+str(i), span=range(n), max_steps=n) for (i, n) in enumerate(dims)]
+    cross = CoverCross('cross', nets, max_steps=None)
+    start = time.perf_counter()
+    for _ in range(calls):
+        cross.advance(rand=True)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time CoverCross.advance() across cross sizes.')
+    parser.add_argument('-n', '--calls', type=int, default=2_000, help='number of advance() calls per size')
+    args = parser.parse_args()
+
+    print('{:<16}{:>14}{:>16}'.format('cross', 'combinations', 'us/advance'))
+    for dims in SIZES:
+        combinations = 1
+        for n in dims:
+            combinations *= n
+        us = measure(dims, args.calls)
+        print('{:<16}{:>14}{:>16.2f}'.format('x'.join([str(n) for n in dims]), combinations, us))
+        pass
+    Coverage.reset()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Measures how many times per second the `value` of a `Signal` can be written and
+read.
+
+Writes are timed for a signal with no port mode, an output port, and an input
+port that drives its simulator object. The simulator object is replaced by a
+plain Python object, so the results measure only the overhead of `Signal`.
+"""
+
+import argparse
+import time
+
+import cocotb
+# create signals without a running simulator
+cocotb.top = None
+
+from verb import Signal
+
+
+class _Handle:
+    """
+    Stands in for a simulator object that accepts writes to its value.
+    """
+    value = 0
+
+
+def _signal(mode: str) -> Signal:
+    """
+    Creates a signal linked to a stand-in simulator object with the port `mode`.
+    """
+    signal = Signal()
+    signal._handle = _Handle()
+    if hasattr(signal, 'set_mode') == True:
+        signal.set_mode(mode)
+    else:
+        signal._mode = mode
+    return signal
+
+
+def writes(signal: Signal, count: int) -> float:
+    """
+    Returns the number of writes per second to the `signal`'s value.
+    """
+    start = time.perf_counter()
+    for i in range(count):
+        signal.value = i
+    return count / (time.perf_counter() - start)
+
+
+def reads(signal: Signal, count: int) -> float:
+    """
+    Returns the number of reads per second of the `signal`'s value.
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        signal.value
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time writes and reads of Signal.value.')
+    parser.add_argument('-n', '--count', type=int, default=1_000_000, help='number of operations per case')
+    args = parser.parse_args()
+
+    cases = [
+        ('write (no mode)', lambda: writes(_signal(None), args.count)),
+        ('write (output)', lambda: writes(_signal('out'), args.count)),
+        ('write (input, driven)', lambda: writes(_signal('in'), args.count)),
+        ('read (no mode)', lambda: reads(_signal(None), args.count)),
+        ('read (input)', lambda: reads(_signal('in'), args.count)),
+    ]
+    print('{:<24}{:>12}'.format('case', 'M ops/s'))
+    for (name, run) in cases:
+        print('{:<24}{:>12.2f}'.format(name, run() / 1e6))
+        pass
+
+
+if __name__ == '__main__':
+    main()
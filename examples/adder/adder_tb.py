@@ -147,8 +147,10 @@ class Adder(Model):
             self.sum.value = temp[self.WORD_SIZE.value-1:0]
             self.cout.value = temp[self.WORD_SIZE.value]
             # verify the outputs
-            vb.assert_eq(self.sum.get_handle(), self.sum)
-            vb.assert_eq(self.cout.get_handle(), self.cout)
+            vb.assert_eq_many([
+                (self.sum.get_handle(), self.sum),
+                (self.cout.get_handle(), self.cout),
+            ])
 
 
 @cocotb.test()
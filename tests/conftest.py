@@ -0,0 +1,16 @@
+import cocotb
+import pytest
+
+# build models and coverage nets without a running simulator
+cocotb.top = None
+
+
+@pytest.fixture(autouse=True)
+def coverage():
+    """
+    Clears the coverage nets created by each test.
+    """
+    from verb.coverage import Coverage
+    Coverage.reset()
+    yield
+    Coverage.reset()
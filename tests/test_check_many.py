@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from verb.coverage import CoverCross, CoverGroup, CoverPoint, CoverRange
+
+
+def _nets(tag: str) -> list:
+    r = CoverRange('r'+tag, span=range(64), goal=3, max_steps=16)
+    g = CoverGroup('g'+tag, bins=[0, 1, 2, 3, 9, 10, 40], goal=2)
+    p = CoverPoint('p'+tag, goal=5)
+    return [r, g, p]
+
+
+def _values(seed: int) -> dict:
+    rng = random.Random(seed)
+    return {
+        'r': [rng.randrange(64) for _ in range(500)],
+        'g': [rng.randrange(48) for _ in range(500)],
+        'p': [rng.randrange(2) for _ in range(500)],
+    }
+
+
+@pytest.mark.parametrize('as_array', [False, True])
+def test_matches_check(as_array):
+    values = _values(1)
+    one = _nets('one')
+    many = _nets('many')
+    for (a, b, key) in zip(one, many, ['r', 'g', 'p']):
+        expected = len([v for v in values[key] if a.check(v) == True])
+        batch = values[key]
+        if as_array == True:
+            np = pytest.importorskip('numpy')
+            batch = np.array(batch)
+        assert b.check_many(batch) == expected, key
+        assert list(b.get_counts()) == list(a.get_counts()), key
+        assert b.get_points_met() == a.get_points_met(), key
+
+
+def test_cross_matches_check():
+    np = pytest.importorskip('numpy')
+    (r1, g1, _) = _nets('one')
+    (r2, g2, _) = _nets('many')
+    c1 = CoverCross('cone', [r1, g1], goal=2)
+    c2 = CoverCross('cmany', [r2, g2], goal=2)
+    rng = random.Random(2)
+    rows = [(rng.randrange(64), rng.choice([0, 1, 2, 3, 9, 10, 40])) for _ in range(800)]
+    expected = len([row for row in rows if c1.check(row) == True])
+    assert c2.check_many(np.array(rows)) == expected
+    assert list(c2.get_counts()) == list(c1.get_counts())
+
+
+def test_restore_counts():
+    (r, g, p) = _nets('a')
+    values = _values(3)
+    for (net, key) in zip((r, g, p), ['r', 'g', 'p']):
+        net.check_many(values[key])
+    (r2, g2, p2) = _nets('b')
+    for (net, copy) in zip((r, g, p), (r2, g2, p2)):
+        copy._restore(list(net.get_counts()))
+        assert list(copy.get_counts()) == list(net.get_counts())
+        assert copy.get_points_met() == net.get_points_met()
+        assert copy.passed() == net.passed()
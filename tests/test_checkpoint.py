@@ -0,0 +1,90 @@
+import pytest
+
+from verb.coverage import Coverage, CoverCross, CoverGroup, CoverPoint, CoverRange
+from verb.coverage.checkpoint import Checkpoint, read_checkpoint
+
+
+def _nets():
+    a = CoverRange('a', span=range(16), goal=2, max_steps=4)
+    b = CoverGroup('b', bins=[0, 1, 2, 5], goal=3)
+    c = CoverPoint('c', goal=4)
+    d = CoverCross('d', [a, b], goal=1)
+    return (a, b, c, d)
+
+
+def _counts(nets) -> dict:
+    return dict([(net._name, list(net.get_counts())) for net in nets])
+
+
+def _write_checkpoints(path) -> list:
+    """
+    Writes a full record followed by two appended records, and then returns the
+    counts of every net after each record.
+    """
+    (a, b, c, d) = nets = _nets()
+    Coverage.checkpoint(str(path), every=None, compact=8)
+    states = []
+    for (x, y, hit) in [(1, 0, True), (5, 2, False), (13, 5, True)]:
+        a.check(x)
+        b.check(y)
+        c.check(hit)
+        d.check((x, y))
+        Checkpoint._active.write()
+        states += [_counts(nets)]
+    Checkpoint.stop()
+    return states
+
+
+def _load(path) -> dict:
+    Coverage.reset()
+    nets = _nets()
+    assert Coverage.load(str(path)) == len(nets)
+    return _counts(nets)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'fcov.ckpt'
+    states = _write_checkpoints(path)
+    (_, records) = read_checkpoint(str(path))
+    assert dict([(name, r['counts']) for (name, r) in records.items()]) == states[-1]
+    assert records['c']['type'] == 'CoverPoint'
+    assert records['b']['goal'] == 3
+    assert _load(path) == states[-1]
+
+
+def test_truncated_tail(tmp_path):
+    path = tmp_path / 'fcov.ckpt'
+    states = _write_checkpoints(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    # the torn record is ignored, so the counts come from the previous record
+    assert _load(path) == states[-2]
+
+
+def test_corrupt_tail(tmp_path):
+    path = tmp_path / 'fcov.ckpt'
+    states = _write_checkpoints(path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert _load(path) == states[-2]
+
+
+def test_compaction(tmp_path):
+    path = tmp_path / 'fcov.ckpt'
+    nets = _nets()
+    Coverage.checkpoint(str(path), every=None, compact=2)
+    for i in range(5):
+        nets[0].check(i)
+        Checkpoint._active.write()
+    Checkpoint.stop()
+    assert (tmp_path / 'fcov.ckpt.tmp').exists() == False
+    (_, records) = read_checkpoint(str(path))
+    assert records['a']['counts'] == list(nets[0].get_counts())
+
+
+def test_not_a_checkpoint(tmp_path):
+    path = tmp_path / 'fcov.ckpt'
+    path.write_bytes(b'not a checkpoint')
+    with pytest.raises(Exception):
+        read_checkpoint(str(path))
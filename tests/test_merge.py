@@ -0,0 +1,68 @@
+import pytest
+
+from verb.coverage import Coverage, CoverGroup, CoverPoint, CoverRange
+from verb.coverage import merge as _merge
+
+
+def _run(path, values: list, bins: tuple=(0, 1, 2, 3), goal: int=2) -> dict:
+    """
+    Writes the json report of a run that checks each of the `values`, and then
+    returns the counts of its nets.
+    """
+    Coverage.reset()
+    r = CoverRange('r', span=range(8), goal=goal, max_steps=4)
+    g = CoverGroup('g', bins=list(bins), goal=goal)
+    p = CoverPoint('p', goal=goal)
+    for v in values:
+        r.check(v % 8)
+        g.check(v % len(bins))
+        p.check(v == 0)
+    Coverage.to_json(str(path))
+    return dict([(net._name, list(net.get_counts())) for net in (r, g, p)])
+
+
+def test_merge_sums_counts(tmp_path):
+    first = _run(tmp_path / 'a.json', [0, 1, 2])
+    second = _run(tmp_path / 'b.json', [0, 5, 6, 7])
+    (iterations, records) = _merge.merge([str(tmp_path / 'a.json'), str(tmp_path / 'b.json')])
+    for name in ('r', 'g', 'p'):
+        assert records[name]['counts'] == [x + y for (x, y) in zip(first[name], second[name])]
+    assert records['p']['counts'] == [2]
+    merged = [c for name in ('r', 'g', 'p') for c in records[name]['counts']]
+    assert _merge.score(records) == (len([c for c in merged if c >= 2]), len(merged))
+
+
+def test_merged_report_loads(tmp_path):
+    _run(tmp_path / 'a.json', [0, 1, 2, 3])
+    _run(tmp_path / 'b.json', [0, 1, 4, 5])
+    (iterations, records) = _merge.merge([str(tmp_path / 'a.json'), str(tmp_path / 'b.json')])
+    _merge.to_json(str(tmp_path / 'merged.json'), iterations, records)
+    Coverage.reset()
+    r = CoverRange('r', span=range(8), goal=2, max_steps=4)
+    g = CoverGroup('g', bins=[0, 1, 2, 3], goal=2)
+    p = CoverPoint('p', goal=2)
+    assert Coverage.load(str(tmp_path / 'merged.json')) == 3
+    for net in (r, g, p):
+        assert list(net.get_counts()) == records[net._name]['counts']
+    assert p.passed() == True
+
+
+def test_mismatched_bins(tmp_path):
+    _run(tmp_path / 'a.json', [0, 1], bins=(0, 1, 2, 3))
+    _run(tmp_path / 'b.json', [0, 1], bins=(0, 1, 2))
+    with pytest.raises(Exception, match='bins'):
+        _merge.merge([str(tmp_path / 'a.json'), str(tmp_path / 'b.json')])
+
+
+def test_mismatched_goal(tmp_path):
+    _run(tmp_path / 'a.json', [0, 1], goal=2)
+    _run(tmp_path / 'b.json', [0, 1], goal=3)
+    with pytest.raises(Exception, match='goal'):
+        _merge.merge([str(tmp_path / 'a.json'), str(tmp_path / 'b.json')])
+
+
+def test_main_threshold(tmp_path):
+    _run(tmp_path / 'a.json', [0, 1, 2, 3])
+    out = str(tmp_path / 'merged.json')
+    assert _merge.main([str(tmp_path / 'a.json'), '-o', out, '--threshold', '0.1']) == 0
+    assert _merge.main([str(tmp_path / 'a.json'), '-o', out]) == 1
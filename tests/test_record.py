@@ -0,0 +1,98 @@
+import pytest
+
+from verb import Model, Signal
+from verb.record import Recorder, read_trace
+
+np = pytest.importorskip('numpy')
+
+
+class _Model(Model):
+
+    def __init__(self):
+        self.a = Signal()
+        self.b = Signal()
+        self.wide = Signal()
+        super().mirror()
+
+
+def _record(path, rows: int, block: int) -> list:
+    """
+    Records `rows` rows of a model into blocks of `block` rows, and then returns
+    the values recorded for each row.
+    """
+    from verb.signal import Logics
+
+    model = _Model()
+    model.a._resize(8)
+    model.b._resize(16)
+    model.wide.value = Logics(0, 100)
+    recorder = Recorder(model, str(path), block=block)
+    expected = []
+    for i in range(rows):
+        model.a.value = i % 256
+        model.b.value = (i * 977) % 65536
+        model.wide.value = Logics((i << 90) | i, 100)
+        recorder.sample()
+        expected += [(i % 256, (i * 977) % 65536, (i << 90) | i)]
+    recorder.close()
+    return expected
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'trace.vrb'
+    expected = _record(path, rows=50, block=7)
+    trace = read_trace(str(path))
+    assert len(trace) == 50
+    assert len(trace._blocks) == 8
+    assert trace.keys() == ['a', 'b', 'wide']
+    assert [trace.width(name) for name in trace.keys()] == [8, 16, 100]
+    for (i, name) in enumerate(trace.keys()):
+        assert trace[name].tolist() == [row[i] for row in expected]
+    trace.close()
+
+
+def test_slices_across_blocks(tmp_path):
+    path = tmp_path / 'trace.vrb'
+    expected = _record(path, rows=50, block=7)
+    trace = read_trace(str(path))
+    b = [row[1] for row in expected]
+    assert trace['b'][5:23].tolist() == b[5:23]
+    assert trace['b'][7:14].tolist() == b[7:14]
+    assert trace['b'][3:48:5].tolist() == b[3:48:5]
+    assert trace['b'][-1] == b[-1]
+    assert trace['b'][21] == b[21]
+    assert len(trace['b'][60:70]) == 0
+    trace.close()
+
+
+def test_torn_block(tmp_path):
+    path = tmp_path / 'trace.vrb'
+    expected = _record(path, rows=50, block=7)
+    data = path.read_bytes()
+    path.write_bytes(data[:-5])
+    # the final block of 1 row is incomplete and ignored
+    trace = read_trace(str(path))
+    assert len(trace) == 49
+    assert trace['a'].tolist() == [row[0] for row in expected[:49]]
+    trace.close()
+
+
+def test_unbound_values(tmp_path):
+    path = tmp_path / 'trace.vrb'
+    model = _Model()
+    model.a.value = -3
+    recorder = Recorder(model, str(path))
+    recorder.sample()
+    recorder.close()
+    trace = read_trace(str(path))
+    # a signal without a known width is stored in 64 bits as two's complement
+    assert trace.width('a') == 64
+    assert trace['a'][0] == (1 << 64) - 3
+    trace.close()
+
+
+def test_not_a_trace(tmp_path):
+    path = tmp_path / 'trace.vrb'
+    path.write_bytes(b'not a trace file')
+    with pytest.raises(Exception):
+        read_trace(str(path))
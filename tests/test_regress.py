@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+
+from verb import regress as _regress
+
+# a stub simulation that covers the bin of its seed, or exits as told by its mode
+_STUB = '''
+import os, sys, time
+import cocotb
+cocotb.top = None
+from verb.coverage import Coverage, CoverGroup
+
+seed = int(os.environ['COCOTB_RANDOM_SEED'])
+mode = sys.argv[1]
+if mode == 'crash':
+    sys.exit(1)
+if mode == 'hang' and seed % 4 != 0:
+    time.sleep(60)
+group = CoverGroup('g', bins=[0, 1, 2, 3], goal=1)
+group.check(seed % 4)
+Coverage.to_json(os.environ['VERB_COVERAGE_FILE'])
+'''
+
+
+def _command(tmp_path, mode: str) -> list:
+    stub = tmp_path / 'stub.py'
+    stub.write_text(_STUB)
+    return [sys.executable, str(stub), mode]
+
+
+def _env() -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return {'PYTHONPATH': root + os.pathsep + os.environ.get('PYTHONPATH', '')}
+
+
+def test_stops_once_covered(tmp_path):
+    out_dir = str(tmp_path / 'regress')
+    summary = _regress.regress(_command(tmp_path, 'ok'), runs=8, jobs=1, seed=0, out_dir=out_dir, env=_env())
+    statuses = [run['status'] for run in summary['runs']]
+    assert statuses == ['passed'] * 4 + ['skipped'] * 4
+    assert summary['covered'] == True
+    assert (summary['count'], summary['points']) == (4, 4)
+    with open(summary['report']) as fd:
+        report = json.load(fd)
+    assert report['count'] == 4
+
+
+def test_terminates_running_simulations(tmp_path):
+    out_dir = str(tmp_path / 'regress')
+    summary = _regress.regress(_command(tmp_path, 'hang'), runs=2, jobs=2, threshold=0.25, seed=0, out_dir=out_dir, env=_env())
+    assert [run['status'] for run in summary['runs']] == ['passed', 'stopped']
+    assert summary['covered'] == True
+
+
+def test_ignores_stale_databases(tmp_path):
+    out_dir = str(tmp_path / 'regress')
+    _regress.regress(_command(tmp_path, 'ok'), runs=4, jobs=2, seed=0, out_dir=out_dir, env=_env())
+    # the same seeds crash before saving their coverage
+    summary = _regress.regress(_command(tmp_path, 'crash'), runs=4, jobs=2, seed=0, out_dir=out_dir, env=_env())
+    assert [run['status'] for run in summary['runs']] == ['failed'] * 4
+    assert [run['coverage'] for run in summary['runs']] == [None] * 4
+    assert summary['iterations'] == 0
+    assert summary['points'] == 0
+
+
+def test_main_exit_code(tmp_path, monkeypatch):
+    out_dir = str(tmp_path / 'regress')
+    args = ['-n', '4', '-j', '2', '--seed', '0', '-o', out_dir, '--']
+    monkeypatch.setenv('PYTHONPATH', _env()['PYTHONPATH'])
+    assert _regress.main(args + _command(tmp_path, 'ok')) == 0
+    assert _regress.main(args + _command(tmp_path, 'crash')) == 1
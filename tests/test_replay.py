@@ -0,0 +1,116 @@
+import pytest
+
+import verb
+from verb import Model, Signal
+from verb.coverage import CoverCross, CoverGroup, CoverPoint, CoverRange
+
+np = pytest.importorskip('numpy')
+
+_ROWS = 3000
+
+
+class _Model(Model):
+
+    def __init__(self):
+        self.a = Signal()
+        self.b = Signal()
+        self.op = Signal()
+        self.v = Signal()
+        super().mirror()
+
+
+def _nets(model: _Model, tag: str) -> list:
+    """
+    Creates one net of each kind sampling the `model`, both with and without a
+    checker function.
+    """
+    ra = CoverRange('ra'+tag, span=range(256), goal=10, max_steps=16, sink=model.a)
+    gb = CoverGroup('gb'+tag, bins=list(range(16)), goal=10, sink=model.op)
+    pv = CoverPoint('pv'+tag, goal=100, sink=model.v)
+    cx = CoverCross('cx'+tag, [ra, gb], goal=2)
+    rc = CoverRange('rc'+tag, span=range(4), goal=10, sink=model.a, checker=lambda s: int(s.value) % 4)
+    gc = CoverGroup('gc'+tag, bins=[0, 1, 2], goal=10, sink=model.op, checker=lambda s: int(s.value) % 3)
+    pc = CoverPoint('pc'+tag, goal=100, sink=(model.a, model.b), checker=lambda x, y: int(x.value) > int(y.value))
+    xc = CoverCross('xc'+tag, [rc, gc], goal=2)
+    return [ra, gb, pv, cx, rc, gc, pc, xc]
+
+
+def _trace():
+    rng = np.random.default_rng(7)
+    trace = np.zeros(_ROWS, dtype=[('a', 'u1'), ('b', 'u1'), ('op', 'u2'), ('v', 'u1')])
+    trace['a'] = rng.integers(0, 256, _ROWS)
+    trace['b'] = rng.integers(0, 256, _ROWS)
+    trace['op'] = rng.integers(0, 20, _ROWS)
+    trace['v'] = rng.random(_ROWS) < 0.1
+    return trace
+
+
+def _live(trace) -> list:
+    """
+    Checks every row of the `trace` through the nets as a simulation would, and
+    then returns the counts of each net.
+    """
+    model = _Model()
+    nets = _nets(model, 'live')
+    for row in trace.tolist():
+        (model.a.value, model.b.value, model.op.value, model.v.value) = row
+        for net in nets:
+            net.check(net.get_sink())
+        pass
+    return [list(net.get_counts()) for net in nets]
+
+
+def _source(kind: str, trace, tmp_path):
+    if kind == 'structured':
+        return trace
+    if kind == 'dict':
+        return dict([(name, trace[name].tolist()) for name in trace.dtype.names])
+    if kind == 'npy':
+        path = tmp_path / 'trace.npy'
+        np.save(str(path), trace)
+        return str(path)
+    if kind == 'npz':
+        path = tmp_path / 'trace.npz'
+        np.savez(str(path), **dict([(name, trace[name]) for name in trace.dtype.names]))
+        return str(path)
+    if kind == 'vrb':
+        from verb.record import Recorder
+        path = tmp_path / 'trace.vrb'
+        model = _Model()
+        for signal in (model.a, model.b, model.op, model.v):
+            signal._resize(16)
+        recorder = Recorder(model, str(path), block=1000)
+        for row in trace.tolist():
+            (model.a.value, model.b.value, model.op.value, model.v.value) = row
+            recorder.sample()
+        recorder.close()
+        return str(path)
+    raise Exception('unknown trace kind: '+kind)
+
+
+@pytest.mark.parametrize('kind', ['structured', 'dict', 'npy', 'npz', 'vrb'])
+def test_replay_matches_live(kind, tmp_path):
+    trace = _trace()
+    expected = _live(trace)
+    source = _source(kind, trace, tmp_path)
+    model = _Model()
+    nets = _nets(model, 'replay')
+    assert verb.replay(model, source, batch=777) == _ROWS
+    for (net, counts) in zip(nets, expected):
+        assert list(net.get_counts()) == counts, net._name
+
+
+def test_replay_restores_signals(tmp_path):
+    model = _Model()
+    _nets(model, 'replay')
+    model.a.value = 11
+    model.b.value = 22
+    verb.replay(model, _trace())
+    assert (int(model.a.value), int(model.b.value)) == (11, 22)
+
+
+def test_mismatched_columns():
+    model = _Model()
+    _nets(model, 'replay')
+    with pytest.raises(Exception):
+        verb.replay(model, {'a': [1, 2, 3], 'b': [1, 2]})
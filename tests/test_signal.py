@@ -0,0 +1,110 @@
+from verb import Signal
+from verb.signal import Logics, _WriteBuffer
+
+
+class _Handle:
+    """
+    Stands in for a simulator object.
+    """
+
+    def __init__(self, value=0):
+        self.value = value
+
+
+def _linked(mode: str, lazy: bool=False) -> tuple:
+    handle = _Handle(7)
+    signal = Signal()
+    signal.set_handle(handle, lazy=lazy)
+    signal.set_mode(mode)
+    return (signal, handle)
+
+
+def test_plain_value():
+    signal = Signal()
+    signal.value = 3
+    assert type(signal) == Signal
+    assert signal.value == 3
+    assert int(signal) == 3
+
+
+def test_input_drives_handle():
+    (signal, handle) = _linked('in')
+    assert isinstance(signal, Signal) == True
+    signal.value = 5
+    assert (signal.value, handle.value) == (5, 5)
+
+
+def test_output_does_not_drive():
+    (signal, handle) = _linked('out')
+    assert type(signal) == Signal
+    signal.value = 5
+    assert (signal.value, handle.value) == (5, 7)
+
+
+def test_mode_change_stops_driving():
+    (signal, handle) = _linked('in')
+    signal.set_mode('out')
+    signal.value = 9
+    assert handle.value == 7
+    signal.set_mode('in')
+    signal.value = 9
+    assert handle.value == 9
+
+
+def test_lazy_snapshot():
+    (signal, handle) = _linked('out', lazy=True)
+    handle.value = 4
+    assert signal.value == 4
+    handle.value = 8
+    assert signal.value == 4
+    assert type(signal) == Signal
+
+
+def test_lazy_write_before_read():
+    (signal, handle) = _linked('out', lazy=True)
+    signal.value = 2
+    assert (signal.value, handle.value) == (2, 7)
+
+
+def test_buffered_input():
+    (signal, handle) = _linked('in')
+    buffer = _WriteBuffer()
+    signal._set_buffer(buffer)
+    signal.value = 6
+    assert handle.value == 7
+    _WriteBuffer.flush_all()
+    assert handle.value == 6
+
+
+def test_width_follows_value():
+    signal = Signal()
+    signal.value = Logics(0, 8)
+    assert (signal.width(), signal.max()) == (8, 255)
+    signal.value = Logics(0, 4)
+    assert signal.max() == 15
+    assert signal.span() == range(0, 16)
+
+
+def test_subclass_drives_handle():
+
+    class _Port(Signal):
+        pass
+
+    handle = _Handle()
+    signal = _Port()
+    signal.set_handle(handle)
+    signal.set_mode('in')
+    signal.value = 1
+    assert type(signal) == _Port
+    assert handle.value == 1
+    signal.set_mode('out')
+    signal.value = 2
+    assert (signal.value, handle.value) == (2, 1)
+
+
+def test_lazy_input():
+    (signal, handle) = _linked('in', lazy=True)
+    handle.value = 3
+    assert signal.value == 3
+    signal.value = 4
+    assert handle.value == 4
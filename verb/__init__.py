@@ -3,9 +3,14 @@ from .log import *
 from .signal import Signal
 from .constant import Constant
 from .model import Model
-from .signal import Dist
+from .replay import replay
+from .signal import Dist, DistTable
 from cocotb.types import LogicArray as Logics
 from cocotb.types import Logic
+import os as _os
+
+# Iteration limit set by a regression runner, which overrides the model's limit
+_LOOP_LIMIT = int(_os.environ['VERB_LOOP_LIMIT']) if _os.environ.get('VERB_LOOP_LIMIT', '') != '' else None
 
 
 def running(limit: int=100_000, stop_if_covered: bool=True) -> bool:
@@ -19,35 +24,30 @@ def running(limit: int=100_000, stop_if_covered: bool=True) -> bool:
     function will return false if all coverages have met their goal before
     reaching the `limit` iteration count.
 
-    The limit can be overridden if the context received a value from the
-    command-line.
+    The limit is overridden by the `VERB_LOOP_LIMIT` environment variable if
+    it is set.
 
     Setting the `limit` to -1 will allow the model to run infinitely.
     """
     from .coverage.net import CoverageNet
     from .coverage import Coverage
-    # if _context.Context.current()._context._max_test_count > -1:
-    #     limit = int(_context.Context.current()._context._max_test_count)
+    from .coverage.checkpoint import Checkpoint
+    if _LOOP_LIMIT is not None:
+        limit = _LOOP_LIMIT
 
     # force the modeling to end if reached the iteration limit
     if limit > 0 and CoverageNet._counter >= limit:
         Coverage.save()
         return False
     # allow modeling to end when all coverages are met
-    if stop_if_covered == True and len(CoverageNet._group) > 0:
-        net: CoverageNet
-        for net in CoverageNet._group:
-            if net.skipped() == False and net.passed() == False:
-                # increment the counter
-                CoverageNet._counter += 1
-                # keep the model running
-                return True
+    if stop_if_covered == True and len(CoverageNet._group) > 0 and len(CoverageNet._failing) == 0:
         # passed all coverages... stop modeling
         Coverage.save()
         return False
-    # increment as normal counter
-    else:
-        CoverageNet._counter += 1
+    # increment the counter and keep the model running
+    CoverageNet._counter += 1
+    if Checkpoint._active is not None:
+        Checkpoint._active.tick()
     return True
 
 
@@ -24,7 +24,9 @@ class Coverage:
         Coverage._passed_coverages = 0
         Coverage._point_count = 0
         Coverage._total_points = 0
+        from .checkpoint import Checkpoint as _Checkpoint
         _CoverageNet.reset()
+        _Checkpoint._active = None
 
     @staticmethod
     def get_nets():
@@ -42,14 +44,7 @@ class Coverage:
         This function excludes coverage nets that are bypassed.
         """
         from .net import CoverageNet as _CoverageNet
-        net: _CoverageNet
-        result = []
-        for net in _CoverageNet._group:
-            # only append nets that are not bypassed and are not completed
-            if net.skipped() == False and net.passed() == False:
-                result += [net]
-            pass
-        return result
+        return list(_CoverageNet._failing)
 
     @staticmethod
     def report(verbose: bool=True) -> str:
@@ -57,12 +52,22 @@ class Coverage:
         Compiles a report of the coverage statistics and details. Setting `verbose`
         to `False` will only provide minimal details to serve as a quick summary.
         """
+        from io import StringIO
+        contents = StringIO()
+        Coverage.write_report(contents, verbose)
+        return contents.getvalue()
+
+    @staticmethod
+    def write_report(fd, verbose: bool=True):
+        """
+        Writes the report of the coverage statistics and details to the file `fd`, one
+        line at a time. Setting `verbose` to `False` will only provide minimal details to
+        serve as a quick summary.
+        """
         from .net import CoverageNet as _CoverageNet
-        contents = ''
         cov: _CoverageNet
         for cov in _CoverageNet._group:
-            contents += cov.log(verbose) + '\n'
-        return contents
+            cov.write_log(fd, verbose)
 
     @staticmethod
     def count() -> int:
@@ -78,26 +83,14 @@ class Coverage:
     @staticmethod
     def tally_score():
         """
-        Iterates through all CoverageNets to compute the ratio of pass/fail.
+        Collects the ratio of pass/fail from the scoreboard kept by the CoverageNets.
         """
         from .net import CoverageNet as _CoverageNet
-        from .status import Status as _Status
 
-        Coverage._total_coverages = 0
-        Coverage._passed_coverages = 0
-        Coverage._point_count = 0
-        Coverage._total_points = 0
-        net: _CoverageNet
-        for net in _CoverageNet._group:
-            if net.status() == _Status.SKIPPED:
-                continue
-            Coverage._total_coverages += 1
-            Coverage._point_count += net.get_points_met()
-            # add up number of points
-            Coverage._total_points += net.get_partition_count()
-            if net.status() == _Status.PASSED:
-                Coverage._passed_coverages += 1
-            pass
+        Coverage._total_coverages = _CoverageNet._net_count
+        Coverage._passed_coverages = _CoverageNet._net_count - len(_CoverageNet._failing)
+        Coverage._point_count = _CoverageNet._points_met
+        Coverage._total_points = _CoverageNet._total_points
 
     @staticmethod
     def percent() -> float:
@@ -119,12 +112,66 @@ class Coverage:
     def save() -> str:
         """
         Saves the report if not already saved, and then returns the absolute path to the file.
+
+        The reports are written to the path in the `VERB_COVERAGE_FILE` environment
+        variable if it is set (with .json and .rpt extensions), or to fcov.json and
+        fcov.rpt otherwise.
         """
+        import os
+        from .checkpoint import Checkpoint as _Checkpoint
         Coverage.tally_score()
+        # write a final checkpoint
+        if _Checkpoint._active is not None:
+            _Checkpoint._active.write()
+        (root, _) = os.path.splitext(os.environ.get('VERB_COVERAGE_FILE', '') or 'fcov.json')
         # write to .json
-        # Coverage.to_json('coverage.json')
+        Coverage.to_json(root + '.json', indent=None)
         # write to report
-        Coverage.to_rpt('fcov.rpt')
+        return Coverage.to_rpt(root + '.rpt')
+
+    @staticmethod
+    def checkpoint(path: str='fcov.ckpt', every: int=10_000, seconds: float=None, compact: int=64):
+        """
+        Periodically writes the counters of all coverage nets to a checkpoint file
+        while `verb.running()` is looping.
+
+        ### Parameters
+        - `path`: the file to write the checkpoints to
+        - `every`: write a checkpoint after this many iterations (disabled if None)
+        - `seconds`: write a checkpoint after this many seconds (disabled if None)
+        - `compact`: rewrite the whole file after this many appended checkpoints
+
+        Only the nets hit since the previous checkpoint are appended to the file,
+        so a checkpoint's cost is proportional to the coverage that changed.
+        """
+        from .checkpoint import Checkpoint as _Checkpoint
+        return _Checkpoint.start(path, every=every, seconds=seconds, compact=compact)
+
+    @staticmethod
+    def load(path: str) -> int:
+        """
+        Restores the bin counts of the coverage nets from a prior run's coverage
+        database, and then returns the number of nets that were restored.
+
+        ### Parameters
+        - `path`: a json report (fcov.json) or a checkpoint file (fcov.ckpt)
+
+        Nets are matched by name, so the nets must be created before loading. Nets
+        in the database that do not exist in the current model are ignored. Only the
+        bin counts are restored, so advancing coverage will target the bins that are
+        still unmet.
+        """
+        from .net import CoverageNet as _CoverageNet
+        (_, records) = _read_counts(path)
+        restored = 0
+        for record in records.values():
+            net: _CoverageNet = _CoverageNet._map.get(record['name'])
+            if net is None:
+                continue
+            net._restore(record['counts'])
+            restored += 1
+            pass
+        return restored
     
     pass
 
@@ -139,28 +186,33 @@ class Coverage:
             return _Status.FAILED
 
     @staticmethod
-    def to_json(path: str):
+    def to_json(path: str, indent: int=4) -> str:
         """
-        Writes the coverage report as a json encoded string.
+        Writes the coverage report as a json encoded string, and then returns the absolute
+        path to the file.
+
+        Each net is encoded and written to the file one bin at a time, so the report is
+        never held in memory as a whole. Setting `indent` to `None` writes compact json.
         """
-        import json
-        from .. import context
+        import os
+        import cocotb
         from .net import CoverageNet as _CoverageNet
 
         net: _CoverageNet
         report = {
-            'seed': context.Context.current()._context._seed,
+            'seed': getattr(cocotb, 'RANDOM_SEED', None),
             'iterations': int(Coverage.count()),
             'score': Coverage.percent(),
             'achieved': Coverage.get_overall_status().to_json(),
             'count': int(Coverage._point_count),
             'points': int(Coverage._total_points),
-            'nets': [net.to_json() for net in _CoverageNet._group]
+            'nets': (net._json_record() for net in _CoverageNet._group)
         }
 
         with open(path, 'w') as fd:
-            json.dump(report, fd, indent=4)
-        pass
+            _write_json(fd, report, indent)
+            fd.write('\n')
+        return os.path.abspath(path)
 
     @staticmethod
     def to_rpt(path: str) -> str:
@@ -209,14 +261,14 @@ class Coverage:
 ; Summary                                    ;
 +--------------------------------------------+             
 ''')
-            f.write(Coverage.report(False))
+            Coverage.write_report(f, False)
             # details
             f.write('''
 +--------------------------------------------+
 ; Details                                    ;
 +--------------------------------------------+             
 ''')
-            f.write(Coverage.report(True))
+            Coverage.write_report(f, True)
             pass
         return os.path.abspath(path)
 
@@ -236,6 +288,99 @@ def check(threshold: float=1.0) -> bool:
     return float(passed/total) >= threshold
 
 
+def _read_counts(path: str) -> tuple:
+    """
+    Reads a coverage database into a tuple of the iteration count and a dictionary
+    that maps each net's name to its record.
+
+    The database can be either a checkpoint file or a json report. A net's record
+    is a dictionary holding its 'name', 'type', 'goal', 'bypass' flag, and list of
+    'counts'. Records read from a json report also hold the list of bin 'labels'.
+    """
+    from .checkpoint import read_checkpoint, _MAGIC
+
+    with open(path, 'rb') as fd:
+        is_checkpoint = fd.read(len(_MAGIC)) == _MAGIC
+    if is_checkpoint == True:
+        return read_checkpoint(path)
+    return _read_json_counts(path)
+
+
+def _read_json_counts(path: str) -> tuple:
+    """
+    Reads a json report into the same structure as `_read_counts(path)`.
+    """
+    import json
+
+    with open(path, 'r') as fd:
+        report = json.load(fd)
+    records = dict()
+    for net in report['nets']:
+        labels = None
+        if 'bins' in net.keys():
+            counts = [int(b['count']) for b in net['bins']]
+            labels = [str(b['name']) for b in net['bins']]
+            goal = int(net['bins'][0]['goal']) if len(net['bins']) > 0 else 0
+        else:
+            counts = [int(net['count'])]
+            goal = int(net['goal'])
+        records[net['name']] = {
+            'name': net['name'],
+            'type': net['type'],
+            'goal': goal,
+            'bypass': net['met'] is None,
+            'counts': counts,
+            'labels': labels,
+        }
+        pass
+    return (int(report.get('iterations', 0)), records)
+
+
+def _write_json(fd, value, indent: int, level: int=0):
+    """
+    Writes `value` to the file `fd` as json, where lists and generators are
+    written one element at a time.
+
+    Setting `indent` to `None` writes compact json.
+    """
+    import json
+    import types
+
+    if isinstance(value, dict):
+        fd.write('{')
+        for i, (key, item) in enumerate(value.items()):
+            if i > 0:
+                fd.write(',')
+            _write_json_newline(fd, indent, level+1)
+            fd.write(json.dumps(str(key)) + (':' if indent is None else ': '))
+            _write_json(fd, item, indent, level+1)
+        if len(value) > 0:
+            _write_json_newline(fd, indent, level)
+        fd.write('}')
+    elif isinstance(value, (list, tuple, types.GeneratorType)):
+        fd.write('[')
+        is_empty = True
+        for item in value:
+            if is_empty == False:
+                fd.write(',')
+            _write_json_newline(fd, indent, level+1)
+            _write_json(fd, item, indent, level+1)
+            is_empty = False
+        if is_empty == False:
+            _write_json_newline(fd, indent, level)
+        fd.write(']')
+    else:
+        fd.write(json.dumps(value))
+
+
+def _write_json_newline(fd, indent: int, level: int):
+    """
+    Starts a new line indented to the nesting `level`, unless writing compact json.
+    """
+    if indent is not None:
+        fd.write('\n' + (' ' * (indent * level)))
+
+
 def _find_longest_str_len(x) -> int:
     """
     Given a list `x`, determines the longest length str.
@@ -244,4 +389,17 @@ def _find_longest_str_len(x) -> int:
     for item in x:
         if len(str(item)) > longest:
             longest = len(str(item))
-    return longest
\ No newline at end of file
+    return longest
+
+
+def _hit_lines(hits: dict):
+    """
+    Produces a line for each value and its count in `hits`, sorted by value and
+    aligned by the longest value.
+    """
+    seq = sorted(hits.items())
+    keys = [str(key) for (key, _) in seq]
+    # determine the string formatting by identifying longest string
+    sub_longest_len = _find_longest_str_len(keys)
+    for (key, (_, val)) in zip(keys, seq):
+        yield '    ' + key + ': ' + (' ' * (sub_longest_len - len(key))) + str(val)
@@ -0,0 +1,200 @@
+"""
+Periodic checkpoints of the coverage nets' counters during simulation.
+
+A checkpoint file starts with a magic string followed by a sequence of records.
+Each record is framed by its payload length and CRC-32, so a record left torn by
+a crash is detected and ignored when the file is read back.
+
+A record's payload stores the iteration count, and then the name, type, goal,
+bypass flag, and partition counts of each net included in the record. When read
+back, a net's counts come from the last record that includes the net.
+"""
+
+import struct as _struct
+
+_MAGIC = b'VRBCKPT1'
+_FRAME = _struct.Struct('<II')
+_HEADER = _struct.Struct('<QI')
+_NET = _struct.Struct('<QBI')
+
+
+class Checkpoint:
+    """
+    Writes the counters of all coverage nets to a compact binary file every few
+    iterations of `verb.running()` or every few seconds.
+
+    Each checkpoint appends a record with the counters of only the nets that were
+    hit since the previous checkpoint. After every `compact` appended records, the
+    file is rewritten with one record holding every net, which is made atomic by
+    writing to a temporary file and renaming it over the checkpoint.
+    """
+
+    # The checkpoint being written during the current simulation
+    _active = None
+
+    def __init__(self, path: str, every: int=10_000, seconds: float=None, compact: int=64):
+        """
+        Create a new `Checkpoint` object.
+
+        ### Parameters
+        - `path`: the file to write the checkpoints to
+        - `every`: write a checkpoint after this many iterations (disabled if None)
+        - `seconds`: write a checkpoint after this many seconds (disabled if None)
+        - `compact`: rewrite the whole file after this many appended records
+        """
+        import time
+
+        self._path = path
+        self._every = every
+        self._seconds = seconds
+        self._compact = compact
+        # the number of hits of each net when it was last written
+        self._written = dict()
+        self._records = 0
+        self._last_counter = 0
+        self._last_time = time.monotonic()
+
+    @staticmethod
+    def start(path: str='fcov.ckpt', every: int=10_000, seconds: float=None, compact: int=64):
+        """
+        Enables writing checkpoints for the current simulation.
+        """
+        Checkpoint._active = Checkpoint(path, every=every, seconds=seconds, compact=compact)
+        return Checkpoint._active
+
+    @staticmethod
+    def stop():
+        """
+        Writes a final checkpoint and disables writing checkpoints.
+        """
+        if Checkpoint._active is not None:
+            Checkpoint._active.write()
+        Checkpoint._active = None
+
+    def tick(self):
+        """
+        Writes a checkpoint if enough iterations or time have passed since the
+        previous checkpoint.
+
+        This method is called by `verb.running()` every time it increments the
+        iteration counter.
+        """
+        from .net import CoverageNet as _CoverageNet
+
+        if self._every is not None and _CoverageNet._counter - self._last_counter >= self._every:
+            self.write()
+        elif self._seconds is not None:
+            import time
+            if time.monotonic() - self._last_time >= self._seconds:
+                self.write()
+
+    def write(self):
+        """
+        Writes a checkpoint of the nets that changed since the previous checkpoint.
+        """
+        import os
+        import time
+        from .net import CoverageNet as _CoverageNet
+
+        self._last_counter = _CoverageNet._counter
+        self._last_time = time.monotonic()
+        # rewrite the file as a single full record
+        if self._records == 0 or self._records >= self._compact or os.path.exists(self._path) == False:
+            self._written = dict()
+            record = self._encode(_CoverageNet._group)
+            tmp_path = self._path + '.tmp'
+            with open(tmp_path, 'wb') as fd:
+                fd.write(_MAGIC + record)
+                fd.flush()
+                os.fsync(fd.fileno())
+            os.replace(tmp_path, self._path)
+            self._records = 1
+            return
+        # append only the nets that were hit since the previous checkpoint
+        changed = [net for net in _CoverageNet._group if self._written.get(net._name) != net.get_total_points_met()]
+        if len(changed) == 0:
+            return
+        record = self._encode(changed)
+        with open(self._path, 'ab') as fd:
+            fd.write(record)
+        self._records += 1
+
+    def _encode(self, nets) -> bytes:
+        """
+        Encodes the counters of the `nets` into a framed record.
+        """
+        import zlib
+        from .net import CoverageNet as _CoverageNet
+
+        parts = [_HEADER.pack(_CoverageNet._counter, len(nets))]
+        net: _CoverageNet
+        for net in nets:
+            counts = net.get_counts()
+            parts += [
+                _encode_str(net._name),
+                _encode_str(net.get_type()),
+                _NET.pack(net.get_total_goal_count() // max(len(counts), 1), int(net.skipped()), len(counts)),
+                _encode_counts(counts),
+            ]
+            self._written[net._name] = net.get_total_points_met()
+            pass
+        payload = b''.join(parts)
+        return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_checkpoint(path: str) -> tuple:
+    """
+    Reads a checkpoint file into a tuple of the iteration count and a dictionary
+    that maps each net's name to its record.
+
+    A net's record is a dictionary holding its 'name', 'type', 'goal', 'bypass'
+    flag, and list of 'counts'. Reading stops at the first torn or corrupted record.
+    """
+    import zlib
+
+    with open(path, 'rb') as fd:
+        data = fd.read()
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise Exception('file '+str(path)+' is not a coverage checkpoint')
+    iterations = 0
+    nets = dict()
+    pos = len(_MAGIC)
+    while pos + _FRAME.size <= len(data):
+        (size, crc) = _FRAME.unpack_from(data, pos)
+        payload = data[pos+_FRAME.size:pos+_FRAME.size+size]
+        if len(payload) != size or zlib.crc32(payload) != crc:
+            break
+        pos += _FRAME.size + size
+        (iterations, count) = _HEADER.unpack_from(payload, 0)
+        offset = _HEADER.size
+        for _ in range(count):
+            (name, offset) = _decode_str(payload, offset)
+            (kind, offset) = _decode_str(payload, offset)
+            (goal, bypass, bins) = _NET.unpack_from(payload, offset)
+            offset += _NET.size
+            counts = list(_struct.unpack_from('<'+str(bins)+'Q', payload, offset))
+            offset += 8 * bins
+            nets[name] = {
+                'name': name,
+                'type': kind,
+                'goal': goal,
+                'bypass': bool(bypass),
+                'counts': counts,
+            }
+            pass
+    return (iterations, nets)
+
+
+def _encode_str(s: str) -> bytes:
+    data = s.encode('utf-8')
+    return _struct.pack('<H', len(data)) + data
+
+
+def _decode_str(payload: bytes, offset: int) -> tuple:
+    (size,) = _struct.unpack_from('<H', payload, offset)
+    offset += 2
+    return (payload[offset:offset+size].decode('utf-8'), offset + size)
+
+
+def _encode_counts(counts) -> bytes:
+    return _struct.pack('<'+str(len(counts))+'Q', *counts)
@@ -1,4 +1,4 @@
-from .net import CoverageNet
+from .net import CoverageNet, _numpy
 from .ranger import CoverRange
 
 class CoverCross(CoverageNet):
@@ -16,23 +16,31 @@ class CoverCross(CoverageNet):
         """
         return 'CoverCross'
 
-    def __init__(self, name: str, nets: List[CoverageNet], goal: int=1, bypass: bool=False, max_steps: int=64, target=None, source=None, sink=None):
+    def __init__(self, name: str, nets: List[CoverageNet], goal: int=1, bypass: bool=False, max_steps: int=64, target=None, source=None, sink=None, max_hits: int=0):
         """
         Create a new `CoverCross` instance.
 
         ### Parameters
         - `nets`: specify the coverage nets to cross
         - `max_steps`: specify the maximum number of steps to cover the entire range
+        - `max_hits`: specify the maximum number of distinct combinations to count per step (unbounded if None)
+
+        Only the count of each step is tracked by default, as for a `CoverRange`.
         """
         self._nets = nets[::-1]
         self._goal = goal
         self._max_steps = max_steps
 
         self._crosses = len(self._nets)
-        
+
+        # mixed-radix digits go x, y, z... so the first digit belongs to the last net
+        self._radices = [net.get_partition_count() for net in self._nets[::-1]]
+        # compute the place value of each digit once for packing and flattening
+        self._strides = []
         combinations = 1
-        for n in self._nets:
-            combinations *= n.get_partition_count()
+        for radix in self._radices:
+            self._strides += [combinations]
+            combinations *= radix
             pass
 
         self._inner = CoverRange(
@@ -41,7 +49,7 @@ class CoverCross(CoverageNet):
             goal=self._goal,
             bypass=bypass,
             max_steps=self._max_steps,
-            
+            max_hits=max_hits,
         )
 
         sink = []
@@ -64,12 +72,19 @@ class CoverCross(CoverageNet):
             pass
         # remove the interior range net and only track this outer net
         CoverageNet._group.pop()
+        self._inner._untrack()
         
         super().__init__(name=name, bypass=bypass, target=target, source=source, sink=sink)
         pass
 
     def to_json(self) -> dict:
-        data = self._inner.to_json()
+        data = self._json_record()
+        data['bins'] = list(data['bins'])
+        return data
+
+    def _json_record(self) -> dict:
+        data = self._inner._json_record()
+        data['type'] = self.get_type()
         return data
 
     def get_total_goal_count(self) -> int:
@@ -102,26 +117,18 @@ class CoverCross(CoverageNet):
 
     def advance(self, rand=False):
         index = self._inner.advance(rand)
+        if index is None:
+            return None
         # convert the 1-dimensional value into its n-dimensional value
         item = self._pack(index)
-        # print(index, '->', item)
-        # print('----', self._inner.get_partition_count())
-
-        j = self._flatten(item)
-        # print(item, '->', j)
 
         n = self.get_cross_count()
 
         final = []
         # expand to the entire parition space for each element
         for i, net in enumerate(self._nets):
-            # print(net.advance(rand))
-            # print(net, net.get_range().step)
-            # print(self._nets[n-i-1].get_range().step)
             final += [item[i] * self._nets[n-i-1].get_range().step]
 
-        # print(index, '-->', item, final)
-        # exit('implement!')
         return final[::-1]
 
     def get_range(self) -> range:
@@ -145,39 +152,14 @@ class CoverCross(CoverageNet):
     def _pack(self, index):
         """
         Packs a 1-dimensional index into a N-dimensional item.
+
+        The index is decoded as a mixed-radix number, where each digit's radix is
+        the partition count of its corresponding net.
         """
-        # print('to3D!')
-        # initialize the set of values to store in the item
+        index = int(index)
         item = [0] * self.get_cross_count()
-
-        subgroup_sizes = [1] * self.get_cross_count()
-        # print(subgroup_sizes)
-        for i in range(self.get_cross_count()):
-            subgroup_sizes[i] = self._nets[i].get_partition_count()
-            # for j in range(i+1, self.get_cross_count()):
-            #     subgroup_sizes[i] *= self._nets[i].get_partition_count()
-        #     pass
-        # print(index)
-        subgroup_sizes = subgroup_sizes[::-1]
-        #  print('sub', subgroup_sizes)
-        # perform counting sequence and perform propery overflow/handling of the carry
-        for i in range(0, index):
-            item[0] += 1
-            carry = True
-            if item[0] >= subgroup_sizes[0]:
-                item[0] = 0
-            else:
-                carry = False
-            j = 1
-            while carry == True and j < self.get_cross_count():
-                item[j] += 1
-                if item[j] >= subgroup_sizes[j]:
-                    item[j] = 0
-                else:
-                    carry = False
-                j += 1
-                pass
-
+        for i, radix in enumerate(self._radices):
+            item[i] = (index // self._strides[i]) % radix
         return item
 
     def _flatten(self, item):
@@ -187,20 +169,12 @@ class CoverCross(CoverageNet):
         Reference: 
         - https://stackoverflow.com/questions/7367770/how-to-flatten-or-index-3d-array-in-1d-array
         """
-        # print('to 1d!')
         if len(item) != self.get_cross_count():
             raise Exception("Expects "+str(self._crosses)+" values in pair")
         index = 0
-        #  print('3d:', item)
-        # dimensions go: x, y, z... so reverse the tuple/list
-        weights = [1]
-        n = self.get_cross_count()
+        # dimensions go: x, y, z... so the first digit carries the smallest place value
         for i, d in enumerate(item):
-            index += int(d) * weights[-1]
-            weights += [weights[-1] * self._nets[n-i-1].get_partition_count()]
-            pass
-        # print(weights)
-        # print('NOW:', index)
+            index += int(d) * self._strides[i]
         return index
 
     def _map_onto_range(self, item):
@@ -221,6 +195,12 @@ class CoverCross(CoverageNet):
     def get_total_points_met(self) -> int:
         return self._inner.get_total_points_met()
 
+    def get_counts(self) -> list:
+        return self._inner.get_counts()
+
+    def _set_counts(self, counts: list):
+        self._inner._set_counts(counts)
+
     def check(self, item):
         if self.is_in_sample_space(item) == False:
             return None
@@ -230,7 +210,47 @@ class CoverCross(CoverageNet):
         rev = rev[::-1]
         # divide by the steps
         index = self._flatten(rev)
-        return self._inner.check(index)
+        points_met = self._inner.get_points_met()
+        is_progress = self._inner.check(index)
+        self._score(self._inner.get_points_met() - points_met)
+        return is_progress
+
+    def check_many(self, values) -> int:
+        """
+        Checks every item in `values` as if by `check(item)`, and then returns the
+        number of items that got the cross closer to meeting coverage.
+
+        When NumPy is installed, `values` can be a 2-dimensional array with one
+        column per crossed net, which is flattened onto the cross product at once.
+        """
+        np = _numpy()
+        if np is None:
+            indices = []
+            for item in values:
+                if self.is_in_sample_space(item) == True:
+                    indices += [self._flatten([int(int(it) / self._nets[i].get_range().step) for i, it in enumerate(item)][::-1])]
+                pass
+        else:
+            items = np.asarray(values)
+            if items.ndim != 2 or items.dtype.kind not in 'iub':
+                items = np.array([[int(it) for it in item] for item in values], dtype=np.int64).reshape(-1, self.get_cross_count())
+            if items.shape[1] != self.get_cross_count():
+                raise Exception("Expects "+str(self._crosses)+" values in pair")
+            keep = np.ones(len(items), dtype=bool)
+            indices = np.zeros(len(items), dtype=np.int64)
+            n = self.get_cross_count()
+            net: CoverageNet
+            for (i, net) in enumerate(self._nets):
+                column = items[:, i]
+                keep &= net._sample_space_mask(column)
+                # the digits are reversed before flattening
+                indices += (column.astype(np.int64) // net.get_range().step) * self._strides[n-i-1]
+                pass
+            indices = indices[keep]
+        points_met = self._inner.get_points_met()
+        progress = self._inner.check_many(indices)
+        self._score(self._inner.get_points_met() - points_met)
+        return progress
 
     def passed(self):
         return self._inner.passed()
@@ -238,4 +258,7 @@ class CoverCross(CoverageNet):
     def to_string(self, verbose: bool):
         return self._inner.to_string(verbose)
 
+    def _string_lines(self, verbose: bool):
+        return self._inner._string_lines(verbose)
+
     pass
@@ -1,4 +1,9 @@
-from .net import CoverageNet
+from array import array as _array
+from .net import CoverageNet, _UnmetBins, _add_counts, _counters, _numpy
+
+# Largest ratio of the span of the bins' values to the number of bins that is
+# indexed by a dense table instead of a hash map
+_DENSE_RATIO = 4
 
 class CoverGroup(CoverageNet):
     """
@@ -25,17 +30,15 @@ class CoverGroup(CoverageNet):
         # stores the items per index for each bin group
         self._macro_bins = []
         # stores the count for each bin
-        self._macro_bins_count = []
+        self._macro_bins_count = _counters(0)
         # store a hash to the index in the set of bins list
         self._bins_lookup = dict()
 
-        # store the counts of individual items
-        self._item_counts = dict()
+        # store the counts of individual items (by their index in the set of bins)
+        self._item_counts = _counters(0)
 
         # defining a bin range is more flexible for defining a large space
 
-        # store the actual values when mapped items cover toward the goal
-        self._mapped_items = dict()
         self._max_bins = max_bins
         self._goal = goal
 
@@ -43,6 +46,8 @@ class CoverGroup(CoverageNet):
 
         # initialize the total count of all covers
         self._total_count = 0
+        # initialize the number of bins that reached their goal
+        self._points_met = 0
 
         # store the function to map items into the coverage space
         self._fn_cover = checker
@@ -67,24 +72,46 @@ class CoverGroup(CoverageNet):
                 pass
             self._macro_bins[i_macro] += [int(item)]
             pass
+        self._item_counts = _counters(len(self._bins_lookup))
+        # index mostly contiguous integer bins directly by their offset from the lowest bin
+        self._dense = None
+        self._dense_base = 0
+        if len(self._bins_lookup) > 0:
+            lo = min(self._bins_lookup.keys())
+            span = max(self._bins_lookup.keys()) - lo + 1
+            if span <= _DENSE_RATIO * len(self._bins_lookup):
+                self._dense_base = lo
+                self._dense = _array('q', [-1]) * span
+                for (item, i) in self._bins_lookup.items():
+                    self._dense[item - lo] = i
+                pass
+        # every bin has already reached an empty goal
+        if self._goal <= 0:
+            self._points_met = len(self._macro_bins_count)
+        # index the bins that still need to reach their goal
+        self._unmet = _UnmetBins(len(self._macro_bins_count) - self._points_met)
 
         super().__init__(name=name, bypass=bypass, target=target, source=source, sink=sink)
         pass
 
     def to_json(self) -> dict:
+        data = self._json_record()
+        data['bins'] = list(data['bins'])
+        return data
+
+    def _json_record(self) -> dict:
         data = super().to_json()
-        bins_reached = 0
-        # compute the number of bins that reached their goal
-        for c in self._macro_bins_count:
-            if c >= self._goal:
-                bins_reached += 1
-            pass
-        more_data = {
+        data.update({
             'count': int(self.get_points_met()),
             'goal': int(self.get_total_goal_count()),
-        }
+            'bins': self._json_bins(),
+        })
+        return data
 
-        bins = []
+    def _json_bins(self):
+        """
+        Produces the json-friendly data structure of each bin one at a time.
+        """
         for i, macro in enumerate(self._macro_bins):
             cur_bin = {
                 'name': self._macro_to_string(i),
@@ -94,20 +121,16 @@ class CoverGroup(CoverageNet):
             }
             hits = []
             for hit in macro:
-                if hit in self._item_counts.keys():
+                count = self._item_counts[self._bins_lookup[hit]]
+                if count > 0:
                     hit = {
                         'value': str(hit),
-                        'count': int(self._item_counts[hit])
+                        'count': int(count)
                     }
                     hits += [hit]
                 pass
             cur_bin['hits'] = hits
-            bins += [cur_bin]
-            pass
-
-        more_data['bins'] = bins
-        data.update(more_data)
-        return data
+            yield cur_bin
 
     def get_total_goal_count(self) -> int:
         return self._goal * len(self._macro_bins_count)
@@ -130,22 +153,69 @@ class CoverGroup(CoverageNet):
         return self._goal * len(self._macro_bins_count)
 
     def get_count(self) -> int:
-        points_met = 0
-        for count in self._macro_bins_count:
-            if count >= self._goal:
-                points_met += 1
-        return points_met
+        return self._points_met
 
     def _transform(self, item):
         return int(item if self._fn_cover == None else self._fn_cover(item))
 
+    def _index(self, mapped_item: int) -> int:
+        """
+        Returns the index of the `mapped_item` in the set of bins, or -1 if it is
+        not a bin.
+        """
+        if self._dense is not None:
+            offset = mapped_item - self._dense_base
+            if offset >= 0 and offset < len(self._dense):
+                return self._dense[offset]
+            return -1
+        return self._bins_lookup.get(mapped_item, -1)
+
+    def _index_many(self, mapped):
+        """
+        Returns the indices in the set of bins of the `mapped` items that are bins.
+        """
+        np = _numpy()
+        if np is not None:
+            items = np.asarray(mapped)
+            if items.ndim == 1 and items.dtype.kind in 'iub':
+                if items.dtype == np.uint64:
+                    items = items[items <= np.iinfo(np.int64).max]
+                items = items.astype(np.int64)
+                if self._dense is not None:
+                    offsets = items - self._dense_base
+                    offsets = offsets[(offsets >= 0) & (offsets < len(self._dense))]
+                    indices = np.frombuffer(self._dense, dtype=np.int64)[offsets]
+                    return indices[indices >= 0].astype(np.intp)
+                keys = np.fromiter(self._bins_lookup.keys(), dtype=np.int64, count=len(self._bins_lookup))
+                values = np.fromiter(self._bins_lookup.values(), dtype=np.intp, count=len(self._bins_lookup))
+                order = np.argsort(keys)
+                pos = np.searchsorted(keys, items, sorter=order).clip(0, max(len(keys)-1, 0))
+                found = keys[order[pos]] == items if len(keys) > 0 else np.zeros(len(items), dtype=bool)
+                return values[order[pos[found]]]
+            items = np.fromiter((self._index(int(item)) for item in mapped), dtype=np.intp)
+            return items[items >= 0]
+        indices = [self._index(int(item)) for item in mapped]
+        return [i for i in indices if i >= 0]
+
     def is_in_sample_space(self, item) -> bool:
-        return self._bins_lookup.get(self._transform(item)) != None
+        return self._index(self._transform(item)) >= 0
     
+    def _sample_space_mask(self, items):
+        np = _numpy()
+        if self._fn_cover != None:
+            return super()._sample_space_mask(items)
+        if self._dense is not None:
+            offsets = items.astype(np.int64) - self._dense_base
+            mask = (offsets >= 0) & (offsets < len(self._dense))
+            mask[mask] = np.frombuffer(self._dense, dtype=np.int64)[offsets[mask]] >= 0
+            return mask
+        return np.isin(items, np.fromiter(self._bins_lookup.keys(), dtype=np.int64, count=len(self._bins_lookup)))
+
     def _map_onto_range(self, item) -> int:
-        if self.is_in_sample_space(item) == False:
+        i = self._index(self._transform(item))
+        if i < 0:
             return None
-        return int(self._bins_lookup[self._transform(item)])
+        return i
 
     def get_range(self) -> range:
         return range(0, len(self._bins_lookup.keys()), self._items_per_bin)
@@ -158,7 +228,7 @@ class CoverGroup(CoverageNet):
         """
         Returns the macro index for the `item` according to the bin division.
         """
-        return int(self._bins_lookup[item] / self._items_per_bin)
+        return self._index(item) // self._items_per_bin
     
     def check(self, item):
         """
@@ -166,46 +236,57 @@ class CoverGroup(CoverageNet):
 
         This means that the item covered is under the goal.
         """
-        if self.is_in_sample_space(item) == False:
-            return False
         # use special mapping function if defined
         mapped_item = self._transform(item)
+        i_item = self._index(mapped_item)
+        if i_item < 0:
+            return False
         # got the item, but check its relative items under the same goal
-        i_macro = self._get_macro_bin_index(mapped_item)
+        i_macro = i_item // self._items_per_bin
         # make the item exists as a possible entry and its macro goal is not met
         is_progress = self._macro_bins_count[i_macro] < self._goal
         # update the map with the value
         self._macro_bins_count[i_macro] += 1
+        if self._macro_bins_count[i_macro] == self._goal:
+            self._points_met += 1
+            self._unmet.remove(i_macro)
+            self._score(1)
         # update the total count
         self._total_count += 1
-        # record the actual value that initiated this coverage
-        if self._fn_cover != None:
-            if i_macro not in self._mapped_items.keys():
-                self._mapped_items[i_macro] = dict()
-            if mapped_item not in self._mapped_items[i_macro].keys():
-                self._mapped_items[i_macro][mapped_item] = 0 
-            # increment the count of this item being detected
-            self._mapped_items[i_macro][mapped_item] += 1
-            pass
         # track individual count for this item
-        if mapped_item not in self._item_counts.keys():
-            self._item_counts[mapped_item] = 0
-        self._item_counts[mapped_item] += 1
+        self._item_counts[i_item] += 1
 
         return is_progress
+
+    def check_many(self, values) -> int:
+        """
+        Checks every item in `values` as if by `check(item)`, and then returns the
+        number of items that got the entire group closer to meeting coverage.
+
+        The whole batch is counted at once, which is vectorized when NumPy is
+        installed.
+        """
+        if self._fn_cover != None:
+            values = [self._transform(item) for item in values]
+        items = self._index_many(values)
+        if isinstance(items, list) == True:
+            macros = [i // self._items_per_bin for i in items]
+        else:
+            macros = items // self._items_per_bin
+        _add_counts(self._item_counts, items, 0)
+        return self._count_many(self._macro_bins_count, macros)
     
     def get_total_points_met(self) -> int:
-        points_met = 0
-        for count in self._macro_bins_count:
-            points_met += count
-        return points_met
+        return self._total_count
+
+    def get_counts(self) -> list:
+        return self._macro_bins_count
+
+    def _set_counts(self, counts: list):
+        self._macro_bins_count = self._load_bins(counts)
     
     def get_points_met(self) -> int:
-        points_met = 0
-        for count in self._macro_bins_count:
-            if count >= self._goal:
-                points_met += 1
-        return points_met
+        return self._points_met
     
     def advance(self, rand=False):
         """
@@ -227,24 +308,19 @@ class CoverGroup(CoverageNet):
         if self._fn_advance != None:
             raise Exception("Implement inverse mapping")
         
-        available = []
-        # filter out the elements who have not yet met the goal
-        for i, count in enumerate(self._macro_bins_count):
-            if count < self._goal:
-                available += [i]
-            pass
-        if len(available) == 0:
-            return None
-        
         next_value = None
         if rand == True:
             # pick a random macro bin
-            i_macro = _random.choice(available)
+            i_macro = self._unmet.choice()
+            if i_macro is None:
+                return None
             # select a random item from the bin
             next_value = _random.choice(self._macro_bins[i_macro])
         else:
             # provide 1st available if random is disabled
-            i_macro = available[0]
+            i_macro = self._unmet.first()
+            if i_macro is None:
+                return None
             next_value = self._macro_bins[i_macro][0]
             
         # assign the next value for the single source
@@ -258,11 +334,7 @@ class CoverGroup(CoverageNet):
         Checks if each bin within the `CoverGroup` has met or exceeded its goal. 
         If any of the bins has not, then whole function fails and returns `False`.
         """
-        for val in self._macro_bins_count:
-            # fail on first failure
-            if val < self._goal:
-                return False
-        return True
+        return self._points_met >= len(self._macro_bins_count)
     
     def _macro_to_string(self, i) -> str:
         """
@@ -285,39 +357,34 @@ class CoverGroup(CoverageNet):
         return result
 
     def to_string(self, verbose: bool=False) -> str:
-        from . import _find_longest_str_len
-        result = ''
+        return '\n    '.join(self._string_lines(verbose))
+
+    def _string_lines(self, verbose: bool):
+        """
+        Produces the lines of `to_string(verbose)` one at a time.
+        """
+        from . import _find_longest_str_len, _hit_lines
         # print each individual bin and its goal status
         if verbose == True:
+            phrases = [self._macro_to_string(i) for i, _ in enumerate(self._macro_bins)]
             # determine the string formatting by identifying longest string
-            longest_len = _find_longest_str_len([self._macro_to_string(i) for i, _ in enumerate(self._macro_bins)])
-            is_first = True
+            longest_len = _find_longest_str_len(phrases)
+            goal = '/' + str(self._goal)
+            show_hits = self._fn_cover != None and self.get_range().step > 1
             # print the coverage analysis
-            for i, _ in enumerate(self._macro_bins):
-                if is_first == False:
-                    result += '\n    '
-                phrase = str(self._macro_to_string(i))
-                count = self._macro_bins_count[i]
-                result += str(phrase) + ': ' + (' ' * (longest_len - len(str(phrase)))) + str(count) + '/' + str(self._goal)
+            for i, phrase in enumerate(phrases):
+                yield phrase + ': ' + (' ' * (longest_len - len(phrase))) + str(self._macro_bins_count[i]) + goal
                 # enumerate on all mapped values that were detected for this bin
-                if self._fn_cover != None and i in self._mapped_items.keys() and self.get_range().step > 1:
-                    # determine the string formatting by identifying longest string
-                    sub_longest_len = _find_longest_str_len(self._mapped_items[i].keys())
-                    seq = [(key, val) for key, val in self._mapped_items[i].items()]
-                    seq.sort()
-                    for j, (key, val) in enumerate(seq):
-                        result += '\n        '
-                        result += str(key) + ': ' + (' ' * (sub_longest_len - len(str(key)))) + str(val)
-
+                if show_hits == True:
+                    hits = dict()
+                    for item in self._macro_bins[i]:
+                        count = self._item_counts[self._bins_lookup[item]]
+                        if count > 0:
+                            hits[item] = count
                         pass
-                is_first = False
+                    if len(hits) > 0:
+                        yield from _hit_lines(hits)
         # print the number of bins that reached their goal
         else:
-            bins_reached = 0
-            for count in self._macro_bins_count:
-                if count >= self._goal:
-                    bins_reached += 1
-                pass
-            result += str(bins_reached) + '/' + str(len(self._macro_bins_count))
-        return result
-    pass
\ No newline at end of file
+            yield str(self._points_met) + '/' + str(len(self._macro_bins_count))
+    pass
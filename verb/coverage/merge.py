@@ -0,0 +1,174 @@
+"""
+Merges the coverage databases of many independent runs into a single report.
+
+The bin counts of each net are summed across the runs by the net's name. The
+databases are read one at a time, so the memory used by a merge depends on the
+size of the coverage model and not on the number of runs.
+"""
+
+
+def merge(paths) -> tuple:
+    """
+    Sums the bin counts of the coverage databases at `paths`, and then returns a
+    tuple of the total iteration count and a dictionary that maps each net's name
+    to its merged record.
+
+    ### Parameters
+    - `paths`: an iterable of json reports or checkpoint files
+
+    A net's record is a dictionary holding its 'name', 'type', 'goal', 'bypass'
+    flag, and list of 'counts'.
+    """
+    iterations = 0
+    merged = dict()
+    for path in paths:
+        iterations += merge_into(merged, path)
+    return (iterations, merged)
+
+
+def merge_into(merged: dict, path: str) -> int:
+    """
+    Sums the bin counts of the coverage database at `path` into the `merged`
+    records, and then returns the database's iteration count.
+    """
+    from . import _read_counts
+
+    (iterations, records) = _read_counts(path)
+    for (name, record) in records.items():
+        total = merged.get(name)
+        if total is None:
+            merged[name] = record
+            continue
+        if len(total['counts']) != len(record['counts']):
+            raise Exception('cannot merge coverage net "'+str(name)+'" from '+str(path)+': expects '+str(len(total['counts']))+' bins but got '+str(len(record['counts'])))
+        if total['goal'] != record['goal']:
+            raise Exception('cannot merge coverage net "'+str(name)+'" from '+str(path)+': expects a goal of '+str(total['goal'])+' but got '+str(record['goal']))
+        counts = total['counts']
+        for (i, count) in enumerate(record['counts']):
+            counts[i] += count
+        # keep the first bin labels seen for the report
+        if total.get('labels') is None and record.get('labels') is not None:
+            total['labels'] = record['labels']
+        pass
+    return iterations
+
+
+def score(records: dict) -> tuple:
+    """
+    Returns a tuple of the number of bins that met their goal and the total
+    number of bins across the merged `records`, excluding bypassed nets.
+    """
+    met = 0
+    total = 0
+    for record in records.values():
+        if record['bypass'] == True:
+            continue
+        met += _points_met(record)
+        total += len(record['counts'])
+        pass
+    return (met, total)
+
+
+def to_json(path: str, iterations: int, records: dict, indent: int=4) -> str:
+    """
+    Writes the merged `records` as a json report with the same layout as the
+    report written by `Coverage.to_json(...)`, and then returns the absolute path
+    to the file.
+
+    The merged report can be loaded back with `Coverage.load(...)`.
+    """
+    import os
+    from . import _write_json
+    from .status import Status as _Status
+
+    (met, total) = score(records)
+    if total == 0:
+        achieved = _Status.SKIPPED
+    elif met >= total:
+        achieved = _Status.PASSED
+    else:
+        achieved = _Status.FAILED
+    report = {
+        'seed': None,
+        'iterations': int(iterations),
+        'score': round((met/total) * 100.0, 2) if total > 0 else None,
+        'achieved': achieved.to_json(),
+        'count': int(met),
+        'points': int(total),
+        'nets': (_net_json(record) for record in records.values()),
+    }
+    with open(path, 'w') as fd:
+        _write_json(fd, report, indent)
+        fd.write('\n')
+    return os.path.abspath(path)
+
+
+def _points_met(record: dict) -> int:
+    """
+    Returns the number of bins in the `record` that met their goal.
+    """
+    goal = record['goal']
+    return len([count for count in record['counts'] if count >= goal])
+
+
+def _net_json(record: dict) -> dict:
+    """
+    Formats a merged net's `record` into a json-friendly data structure.
+    """
+    goal = record['goal']
+    met = None if record['bypass'] == True else _points_met(record) >= len(record['counts'])
+    data = {
+        'name': record['name'],
+        'type': record['type'],
+        'met': met,
+    }
+    if record['type'] == 'CoverPoint':
+        data['count'] = int(record['counts'][0])
+        data['goal'] = int(goal)
+        return data
+    labels = record.get('labels')
+    data['count'] = int(_points_met(record))
+    data['goal'] = int(goal * len(record['counts']))
+    data['bins'] = ({
+        'name': str(i) if labels is None else labels[i],
+        'met': None if record['bypass'] == True else count >= goal,
+        'count': int(count),
+        'goal': int(goal),
+    } for (i, count) in enumerate(record['counts']))
+    return data
+
+
+def main(argv=None) -> int:
+    """
+    Entry point of the `verb-merge` command-line tool.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='verb-merge',
+        description='Merge the coverage databases (fcov.json or checkpoint files) of many runs.',
+        fromfile_prefix_chars='@',
+    )
+    parser.add_argument('inputs', nargs='+', help='coverage databases to merge (@FILE reads paths from FILE)')
+    parser.add_argument('-o', '--output', default='fcov.json', help='path to write the merged json report')
+    parser.add_argument('--threshold', type=float, default=1.0, help='minimum fraction of points met to exit successfully [0, 1.0]')
+    args = parser.parse_args(argv)
+
+    (iterations, records) = merge(args.inputs)
+    path = to_json(args.output, iterations, records)
+    (met, total) = score(records)
+    print('Runs: ' + str(len(args.inputs)))
+    print('Iterations: ' + str(iterations))
+    print('Score: ' + str(round((met/total) * 100.0, 2) if total > 0 else None))
+    print('Count: ' + str(met))
+    print('Points: ' + str(total))
+    print('Report: ' + path)
+    # same rule as `verb.coverage.check(threshold)`
+    if total <= 0:
+        return 0
+    return 0 if float(met/total) >= args.threshold else 1
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
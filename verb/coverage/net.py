@@ -1,7 +1,142 @@
 from abc import ABC as _ABC
+from array import array as _array
 from .status import Status
 from cocotb.handle import SimHandleBase
 
+
+class _UnmetBins:
+    """
+    An index of the bins that have not yet met their goal.
+
+    The bins are stored in an array alongside each bin's position within the
+    array, so a bin can be removed or picked at random in constant time.
+    """
+
+    def __init__(self, size: int):
+        self._bins = _array('q', range(size))
+        self._pos = _array('q', range(size))
+        # lowest bin that may still be unmet
+        self._first = 0
+
+    def __len__(self) -> int:
+        return len(self._bins)
+
+    def __contains__(self, i: int) -> bool:
+        return self._pos[i] >= 0
+
+    def remove(self, i: int):
+        """
+        Removes bin `i` from the index by swapping in the last bin.
+        """
+        pos = self._pos[i]
+        if pos < 0:
+            return
+        last = self._bins.pop()
+        if last != i:
+            self._bins[pos] = last
+            self._pos[last] = pos
+        self._pos[i] = -1
+
+    def choice(self) -> int:
+        """
+        Returns a random unmet bin, or `None` if every bin is met.
+        """
+        import random as _random
+        if len(self._bins) == 0:
+            return None
+        return self._bins[_random.randrange(len(self._bins))]
+
+    def first(self) -> int:
+        """
+        Returns the lowest unmet bin, or `None` if every bin is met.
+        """
+        # bins are never re-added, so the search resumes where it last stopped
+        while self._first < len(self._pos) and self._pos[self._first] < 0:
+            self._first += 1
+        if self._first >= len(self._pos):
+            return None
+        return self._first
+
+def _count_hit(hits: dict, value, capacity: int, n: int=1):
+    """
+    Counts `n` hits of `value` in the `hits` histogram, which keeps at most
+    `capacity` values (unbounded if None).
+
+    When the histogram is full, the space-saving algorithm is used: the value with
+    the lowest count is replaced by the new value, which inherits that count plus `n`.
+    The most frequent values are kept, and a kept value's count is overestimated by
+    at most the count it inherited.
+    """
+    count = hits.get(value)
+    if count is not None:
+        hits[value] = count + n
+    elif capacity is None or len(hits) < capacity:
+        hits[value] = n
+    elif capacity > 0:
+        evicted = min(hits, key=hits.get)
+        hits[value] = hits.pop(evicted) + n
+
+
+def _counters(size: int) -> _array:
+    """
+    Returns an array of `size` unsigned 64-bit counters set to zero.
+    """
+    return _array('Q', [0]) * size
+
+
+def _numpy():
+    """
+    Returns the NumPy module, or `None` if NumPy is not installed.
+    """
+    try:
+        import numpy as _np
+    except ImportError:
+        return None
+    return _np
+
+
+def _add_counts(counts: _array, indices, goal: int) -> tuple:
+    """
+    Adds one hit to the `counts` for each bin in `indices`, and then returns a
+    tuple of the number of hits that went toward a bin's unmet `goal` and the list
+    of bins that reached their goal.
+
+    The hits are accumulated with a vectorized bincount when NumPy is installed
+    and `indices` is a NumPy array.
+    """
+    np = _numpy()
+    if np is None or isinstance(indices, np.ndarray) == False:
+        added = dict()
+        for i in indices:
+            added[i] = added.get(i, 0) + 1
+        progress = 0
+        met = []
+        for (i, n) in added.items():
+            prev = counts[i]
+            counts[i] = prev + n
+            if prev < goal:
+                progress += min(n, goal - prev)
+                if prev + n >= goal:
+                    met += [i]
+            pass
+        return (progress, met)
+    if len(indices) == 0:
+        return (0, [])
+    # update the counters in place through the array's buffer
+    view = np.frombuffer(counts, dtype=np.uint64)
+    if len(indices) * 4 >= len(counts):
+        added = np.bincount(indices, minlength=len(counts))
+        touched = np.flatnonzero(added)
+        added = added[touched]
+    else:
+        (touched, added) = np.unique(indices, return_counts=True)
+    prev = view[touched]
+    view[touched] = prev + added.astype(np.uint64)
+    need = np.clip(goal - prev.astype(np.int64), 0, None)
+    progress = int(np.minimum(added, need).sum())
+    met = touched[(need > 0) & (added >= need)].tolist()
+    return (progress, met)
+
 class CoverageNet(_ABC):
     """
     A `CoverageNet` is a generic base class inherited by any type of coverage.
@@ -14,6 +149,13 @@ class CoverageNet(_ABC):
     _group = []
     _map = dict()
     _counter = 0
+    # Scoreboard of the tracked nets (excludes bypassed nets)
+    _failing = dict()
+    _net_count = 0
+    _points_met = 0
+    _total_points = 0
+    # Incremented whenever the set of failing nets changes
+    _epoch = 0
 
     @staticmethod
     def reset():
@@ -23,6 +165,11 @@ class CoverageNet(_ABC):
         CoverageNet._group = []
         CoverageNet._map = dict()
         CoverageNet._counter = 0
+        CoverageNet._failing = dict()
+        CoverageNet._net_count = 0
+        CoverageNet._points_met = 0
+        CoverageNet._total_points = 0
+        CoverageNet._epoch += 1
 
     def __init__(self, name: str, bypass: bool=False, target=None, source=None, sink=None):
         """
@@ -72,8 +219,124 @@ class CoverageNet(_ABC):
         CoverageNet._group += [self]
         # to the dictionary for accessibility
         CoverageNet._map[name] = self
+        # add to the scoreboard
+        self._tracked = False
+        self._track()
         pass
 
+    def _track(self):
+        """
+        Adds this net's points to the global scoreboard.
+        """
+        if self._tracked == True or self._bypass == True:
+            return
+        self._tracked = True
+        CoverageNet._net_count += 1
+        CoverageNet._points_met += self.get_points_met()
+        CoverageNet._total_points += self.get_partition_count()
+        if self.passed() == False:
+            CoverageNet._failing[self] = None
+        CoverageNet._epoch += 1
+
+    def _untrack(self):
+        """
+        Removes this net's points from the global scoreboard.
+        """
+        if self._tracked == False:
+            return
+        self._tracked = False
+        CoverageNet._net_count -= 1
+        CoverageNet._points_met -= self.get_points_met()
+        CoverageNet._total_points -= self.get_partition_count()
+        CoverageNet._failing.pop(self, None)
+        CoverageNet._epoch += 1
+
+    def _score(self, points: int):
+        """
+        Records on the global scoreboard that `points` more of this net's
+        partitions have met their goal.
+
+        This function should be called by `check(...)` whenever a partition
+        reaches its goal.
+        """
+        if self._tracked == False:
+            return
+        CoverageNet._points_met += points
+        if self.passed() == True and self in CoverageNet._failing:
+            CoverageNet._failing.pop(self)
+            CoverageNet._epoch += 1
+
+    def _restore(self, counts: list):
+        """
+        Overwrites the hit count of each partition with the `counts`, and then
+        resyncs this net's points on the global scoreboard.
+        """
+        if len(counts) != self.get_partition_count():
+            raise Exception('cannot restore coverage net "'+str(self._name)+'": expects '+str(self.get_partition_count())+' partition counts but got '+str(len(counts)))
+        tracked = self._tracked
+        self._untrack()
+        self._set_counts(counts)
+        if tracked == True:
+            self._track()
+
+    def check_many(self, values) -> int:
+        """
+        Checks every item in `values` as if by `check(item)`, and then returns the
+        number of items for which `check(item)` would have returned true.
+        """
+        progress = 0
+        for item in values:
+            if self.check(item) == True:
+                progress += 1
+            pass
+        return progress
+
+    def _sample_space_mask(self, items):
+        """
+        Returns a NumPy boolean array marking which of the NumPy array of `items`
+        are in the sample space.
+        """
+        np = _numpy()
+        return np.fromiter((self.is_in_sample_space(x) for x in items.tolist()), dtype=bool, count=len(items))
+
+    def _count_many(self, counts: _array, indices) -> int:
+        """
+        Adds the hits of the bins in `indices` to the `counts`, updates which bins
+        have met their goal, and then returns the number of hits that went toward
+        an unmet goal.
+
+        This function should be called by `check_many(...)` for nets that store
+        their bins in `counts`, `_unmet`, and `_points_met`.
+        """
+        (progress, met) = _add_counts(counts, indices, self._goal)
+        self._total_count += len(indices)
+        for i in met:
+            self._unmet.remove(i)
+        if len(met) > 0:
+            self._points_met += len(met)
+            self._score(len(met))
+        return progress
+
+    def _load_bins(self, counts: list) -> _array:
+        """
+        Returns the `counts` as bin counters, and resets the `_total_count`, `_unmet`,
+        and `_points_met` to match them.
+
+        This function should be called by `_set_counts(...)` for nets that store
+        their bins in counters, `_unmet`, and `_points_met`.
+        """
+        bins = _counters(0)
+        bins.extend([int(count) for count in counts])
+        self._total_count = sum(bins)
+        # only the bins still under their goal remain to be advanced
+        self._unmet = _UnmetBins(len(bins))
+        for i, count in enumerate(bins):
+            if count >= self._goal:
+                self._unmet.remove(i)
+            pass
+        self._points_met = len(bins) - len(self._unmet)
+        return bins
+
     def to_json(self) -> dict:
         """
         Formats the coverage net into a json-friendly data structure
@@ -85,6 +348,13 @@ class CoverageNet(_ABC):
         }
         return data
 
+    def _json_record(self) -> dict:
+        """
+        Formats the coverage net into a json-friendly data structure, where any
+        list of bins is produced lazily so it can be streamed.
+        """
+        return self.to_json()
+
     def has_sink(self) -> bool:
         """
         Checks if the net is configured with a set of signal(s) to read from
@@ -111,7 +381,7 @@ class CoverageNet(_ABC):
         self._sink_list = []
         if self.has_sink() == True:
             # transform single signal into a list
-            if type(self._sink) == Signal:
+            if isinstance(self._sink, Signal) == True:
                 self._sink_list = [self._sink]
             else:
                 self._sink_list = list(self._sink)
@@ -130,7 +400,7 @@ class CoverageNet(_ABC):
         self._source_list = []
         if self.has_source() == True:
             # transform single signal into a list
-            if type(self._source) == Signal:
+            if isinstance(self._source, Signal) == True:
                 self._source_list = [self._source]
             else:
                 self._source_list = list(self._source)
@@ -167,6 +437,25 @@ class CoverageNet(_ABC):
         else:
             return label + ": " + self._name + ':' + ' ...'+str(self.status().name) + '\n    ' + self.to_string(verbose)
 
+    def write_log(self, fd, verbose: bool=True):
+        """
+        Writes the same contents as `log(verbose)` followed by a newline to the file `fd`,
+        one line at a time.
+        """
+        if verbose == False:
+            fd.write(self.log(verbose) + '\n')
+            return
+        fd.write(self.get_type() + ": " + self._name + ':' + ' ...'+str(self.status().name))
+        for line in self._string_lines(verbose):
+            fd.write('\n    ' + line)
+        fd.write('\n')
+
+    def _string_lines(self, verbose: bool):
+        """
+        Produces the lines of `to_string(verbose)` one at a time.
+        """
+        yield self.to_string(verbose)
+
     def status(self) -> Status:
         """
         Determine the status of the Coverage node.
@@ -277,6 +566,21 @@ class CoverageNet(_ABC):
         """
         pass
 
+    @_abstractmethod
+    def get_counts(self) -> list:
+        """
+        Returns the hit count of each partition, in order.
+        """
+        pass
+
+    @_abstractmethod
+    def _set_counts(self, counts: list):
+        """
+        Overwrites the hit count of each partition and recomputes which
+        partitions have met their goal.
+        """
+        pass
+
     @_abstractmethod
     def to_string(self, verbose: bool) -> str:
         """
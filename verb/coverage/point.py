@@ -1,4 +1,4 @@
-from .net import CoverageNet
+from .net import CoverageNet, _numpy
 
 class CoverPoint(CoverageNet):
     """
@@ -103,6 +103,12 @@ class CoverPoint(CoverageNet):
     def get_total_points_met(self) -> int:
         return self._count
 
+    def get_counts(self) -> list:
+        return [self._count]
+
+    def _set_counts(self, counts: list):
+        self._count = int(counts[0])
+
     def check(self, item):
         """
         Returns `True` if the `cond` was satisfied and updates the internal count
@@ -113,7 +119,29 @@ class CoverPoint(CoverageNet):
         cond = bool(self._map_onto_range(item))
         if cond == True:
             self._count += 1
+            if self._count == self._goal:
+                self._score(1)
         return cond
+
+    def check_many(self, values) -> int:
+        """
+        Checks every item in `values` as if by `check(item)`, and then returns the
+        number of items that satisfied the condition.
+        """
+        np = _numpy()
+        if np is not None and self._fn_checker == None and isinstance(values, np.ndarray) == True:
+            hits = int(np.count_nonzero(values == 1))
+        else:
+            hits = 0
+            for item in values:
+                if int(self._transform(item)) == 1:
+                    hits += 1
+                pass
+        prev = self._count
+        self._count += hits
+        if prev < self._goal and self._count >= self._goal:
+            self._score(1)
+        return hits
     
     def advance(self, rand=False):
         from ..signal import Signal as _Signal
@@ -1,4 +1,4 @@
-from .net import CoverageNet
+from .net import CoverageNet, _UnmetBins, _count_hit, _counters, _numpy
 
 class CoverRange(CoverageNet):
     """
@@ -14,7 +14,7 @@ class CoverRange(CoverageNet):
         """
         return 'CoverRange'
 
-    def __init__(self, name: str, span: range, goal: int=1, bypass: bool=False, max_steps: int=64, target=None, source=None, sink=None, advancer=None, checker=None):
+    def __init__(self, name: str, span: range, goal: int=1, bypass: bool=False, max_steps: int=64, target=None, source=None, sink=None, advancer=None, checker=None, max_hits: int=0):
         """
         Create a new `CoverRange` object.
 
@@ -22,6 +22,10 @@ class CoverRange(CoverageNet):
         - `span`: specify the range of values to cover
         - `max_steps`: specify the maximum number of steps to cover the entire range
         - `advancer`: a function that accepts the `source` as an argument and returns an integer
+        - `max_hits`: specify the maximum number of distinct values to count per step (unbounded if None)
+
+        Only the count of each step is tracked by default. Setting `max_hits` keeps a
+        histogram of the most frequent values hit within each step for the report.
         """
         import math
 
@@ -33,9 +37,12 @@ class CoverRange(CoverageNet):
 
         # initialize the total count of all covers
         self._total_count = 0
+        # initialize the number of bins that reached their goal
+        self._points_met = 0
 
-        # store the actual values when mapped items cover toward the goal
-        self._mapped_items = dict()
+        # store the most frequent values that cover toward each step's goal
+        self._hits = dict()
+        self._max_hits = max_hits
     
         # define a custom function that should return a boolean to define the targeted point
         self._fn_checker = checker
@@ -53,10 +60,13 @@ class CoverRange(CoverageNet):
             # update instance attributes
             self._step_size = int(math.ceil(abs(self._domain.stop - self._domain.start) / self._max_steps))
             self._num_of_steps = self._max_steps
-        
-        self._table = [[]] * self._num_of_steps
 
-        self._table_counts = [0] * self._num_of_steps
+        self._table_counts = _counters(self._num_of_steps)
+        # every bin has already reached an empty goal
+        if self._goal <= 0:
+            self._points_met = self._num_of_steps
+        # index the bins that still need to reach their goal
+        self._unmet = _UnmetBins(self._num_of_steps - self._points_met)
         # print('len', len(self._table_counts))
         # print(self._step_size)
         self._start = self._domain.start
@@ -64,17 +74,28 @@ class CoverRange(CoverageNet):
 
         super().__init__(name=name, bypass=bypass, target=target, source=source, sink=sink)
 
+    def to_json(self) -> dict:
+        return self.to_json_internal()
+
     def to_json_internal(self) -> dict:
+        data = self._json_record()
+        data['bins'] = list(data['bins'])
+        return data
+
+    def _json_record(self) -> dict:
         data = super().to_json()
-        more_data = {
+        data.update({
             'count': int(self.get_points_met()),
             'goal': int(self.get_total_goal_count()),
-        }
-
-        bins = []
+            'bins': self._json_bins(),
+        })
+        return data
 
-        # print the coverage analysis
-        for i, _ in enumerate(self._table):
+    def _json_bins(self):
+        """
+        Produces the json-friendly data structure of each bin one at a time.
+        """
+        for i in range(len(self._table_counts)):
             # collect a single bin
             if self._step_size > 1:
                 step = str(i * self._step_size) + '..=' + str(((i+1) * self._step_size)-1)
@@ -91,8 +112,8 @@ class CoverRange(CoverageNet):
             }
             # get each hit that helped toward the current bin's goal
             hits = []
-            if self._step_size > 1 and i in self._mapped_items.keys():
-                seq = [(key, val) for key, val in self._mapped_items[i].items()]
+            if self._step_size > 1 and i in self._hits.keys():
+                seq = [(key, val) for key, val in self._hits[i].items()]
                 seq.sort()
                 for (key, val) in seq:
                     cur_hit = {
@@ -103,13 +124,7 @@ class CoverRange(CoverageNet):
                     pass
             # update the current bin's account for its hits
             cur_bin['hits'] = hits
-            # add to the bin list
-            bins += [cur_bin]
-            pass
-
-        more_data['bins'] = bins
-        data.update(more_data)
-        return data
+            yield cur_bin
 
     def get_total_goal_count(self) -> int:
         return self._goal * int(len(self._table_counts))
@@ -118,11 +133,7 @@ class CoverRange(CoverageNet):
         return self._goal * len(self._table_counts)
 
     def get_count(self) -> int:
-        points_met = 0
-        for entry in self._table_counts:
-            if entry >= self._goal:
-                points_met += 1
-        return points_met
+        return self._points_met
 
     def get_range(self) -> range:
         return range(self._start, self._stop, self._step_size)
@@ -131,28 +142,23 @@ class CoverRange(CoverageNet):
         return self._num_of_steps
     
     def get_points_met(self) -> int:
-        points_met = 0
-        for entry in self._table_counts:
-            if entry >= self._goal:
-                points_met += 1
-        return points_met
+        return self._points_met
 
     def get_total_points_met(self) -> int:
-        points_met = 0
-        for entry in self._table_counts:
-            points_met += entry
-        return points_met
+        return self._total_count
+
+    def get_counts(self) -> list:
+        return self._table_counts
+
+    def _set_counts(self, counts: list):
+        self._table_counts = self._load_bins(counts)
     
     def passed(self) -> bool:
         """
         Checks if each bin within the `CoverGroup` has met or exceeded its goal. 
         If any of the bins has not, then whole function fails and returns `False`.
         """
-        for entry in self._table_counts:
-            # exit early on first failure for not meeting coverage goal
-            if entry < self._goal:
-                return False
-        return True
+        return self._points_met >= len(self._table_counts)
 
     def _transform(self, item):
         return int(item) if self._fn_checker == None else int(self._fn_checker(item))
@@ -161,6 +167,11 @@ class CoverRange(CoverageNet):
         mapped_item = self._transform(item)
         return mapped_item >= self._start and mapped_item < self._stop
 
+    def _sample_space_mask(self, items):
+        if self._fn_checker != None:
+            return super()._sample_space_mask(items)
+        return (items >= self._start) & (items < self._stop)
+
     def _map_onto_range(self, item) -> int:
         if self.is_in_sample_space(item) == False:
             return None
@@ -187,18 +198,67 @@ class CoverRange(CoverageNet):
         # check if it improves progessing by adding to a mapping that has not met the goal yet
         is_progress = self._table_counts[index] < self._goal
         # update the coverage for this value
-        self._table[index] += [mapped_item]
         self._table_counts[index] += 1
         self._total_count += 1
-        # track original items that count toward their space of the domain
-        if index not in self._mapped_items.keys():
-            self._mapped_items[index] = dict()
-        # store the count of the integer value of the number for encounters tracking/stats
-        if mapped_item not in self._mapped_items[index].keys():
-            self._mapped_items[index][mapped_item] = 0 
-        # increment the count of this item being detected
-        self._mapped_items[index][mapped_item] += 1
+        if self._table_counts[index] == self._goal:
+            self._points_met += 1
+            self._unmet.remove(index)
+            self._score(1)
+        # track the most frequent values that count toward their space of the domain
+        if self._max_hits != 0:
+            hits = self._hits.get(index)
+            if hits is None:
+                hits = self._hits[index] = dict()
+            _count_hit(hits, mapped_item, self._max_hits)
         return is_progress
+
+    def check_many(self, values) -> int:
+        """
+        Checks every item in `values` as if by `check(item)`, and then returns the
+        number of items that got the range closer to meeting coverage.
+
+        The whole batch is mapped onto the steps and counted at once, which is
+        vectorized when NumPy is installed.
+        """
+        (mapped, indices) = self._map_many(values)
+        progress = self._count_many(self._table_counts, indices)
+        # track the most frequent values that count toward their space of the domain
+        if self._max_hits != 0 and len(mapped) > 0:
+            np = _numpy()
+            if np is not None and isinstance(mapped, np.ndarray) == True:
+                (uniques, counts) = np.unique(mapped, return_counts=True)
+                batch = zip(uniques.tolist(), counts.tolist())
+            else:
+                batch = [(item, 1) for item in mapped]
+            for (item, n) in batch:
+                hits = self._hits.get(item // self._step_size)
+                if hits is None:
+                    hits = self._hits[item // self._step_size] = dict()
+                _count_hit(hits, item, self._max_hits, n)
+            pass
+        return progress
+
+    def _map_many(self, values) -> tuple:
+        """
+        Transforms the `values` and filters out those outside of the sample space,
+        and then returns a tuple of the remaining values and their step indices.
+        """
+        np = _numpy()
+        if self._fn_checker != None:
+            values = [int(self._fn_checker(item)) for item in values]
+        if np is not None:
+            mapped = np.asarray(values)
+            if mapped.dtype.kind == 'b':
+                mapped = mapped.astype(np.int64)
+            # only integer arrays can be mapped without converting each item
+            if mapped.ndim == 1 and mapped.dtype.kind in 'iu':
+                mapped = mapped[(mapped >= self._start) & (mapped < self._stop)]
+                indices = (mapped // self._step_size).astype(np.intp)
+                keep = (indices >= 0) & (indices < len(self._table_counts))
+                return (mapped[keep], indices[keep])
+        mapped = [int(item) for item in values]
+        mapped = [item for item in mapped if item >= self._start and item < self._stop and 0 <= int(item / self._step_size) < len(self._table_counts)]
+        return (mapped, [int(item / self._step_size) for item in mapped])
     
     def advance(self, rand: bool=False):
         """
@@ -240,24 +300,15 @@ class CoverRange(CoverageNet):
                 else:
                     return result
         
-        available = []
-        # filter out the elements who have not yet met the goal
-        for i, count in enumerate(self._table_counts):
-            if count < self._goal:
-                available += [i]
-            pass
-        if len(available) == 0:
-            return None
-
-        next_value = None
         if rand == True:
-            j = _random.choice(available)
-            # transform back to the selection of the expanded domain space
-            next_value = _random.randint(j * self._step_size, ((j+1) * self._step_size) - 1)
+            j = self._unmet.choice()
         else:
             # provide 1st available if random is disabled
-            j = available[0]
-            next_value = _random.randint(j * self._step_size, ((j+1) * self._step_size) - 1)
+            j = self._unmet.first()
+        if j is None:
+            return None
+        # transform back to the selection of the expanded domain space
+        next_value = _random.randint(j * self._step_size, ((j+1) * self._step_size) - 1)
         # assign the next value for the source
         if isinstance(self._source, (list, tuple)) == True:
             self._source[0].value = next_value
@@ -272,43 +323,33 @@ class CoverRange(CoverageNet):
         """
         Formats the relevant data into a string.
         """
-        from . import _find_longest_str_len
-        result = ''
+        return '\n    '.join(self._string_lines(verbose))
+
+    def _string_lines(self, verbose: bool):
+        """
+        Produces the lines of `to_string(verbose)` one at a time.
+        """
+        from . import _hit_lines
         # print each individual bin and its goal status
         if verbose == True:
             # determine the string formatting by identifying longest string
             if self._step_size > 1:
-                longest_len = len(str((len(self._table)-2) * self._step_size) + '..=' + str((len(self._table)-1) * self._step_size))
+                longest_len = len(str((len(self._table_counts)-2) * self._step_size) + '..=' + str((len(self._table_counts)-1) * self._step_size))
             else:
                 longest_len = len(str(self._stop-1))
-            is_first = True
+            goal = '/' + str(self._goal)
             # print the coverage analysis
-            for i, _ in enumerate(self._table):
-                if is_first == False:
-                    result += '\n    '
+            for i, count in enumerate(self._table_counts):
                 if self._step_size > 1:
                     step = str(i * self._step_size) + '..=' + str(((i+1) * self._step_size)-1)
                 else:
-                    step = i
-                count = self._table_counts[i]
-                result += str(step) + ': ' + (' ' * (longest_len - len(str(step)))) + str(count) + '/' + str(self._goal)
-                # determine the string formatting by identifying longest string
-                if self._step_size > 1 and i in self._mapped_items.keys():
-                    sub_longest_len = _find_longest_str_len(self._mapped_items[i].keys())
-                    seq = [(key, val) for key, val in self._mapped_items[i].items()]
-                    seq.sort()
-                    for i, (key, val) in enumerate(seq):
-                        result += '\n        '
-                        result += str(key) + ': ' + (' ' * (sub_longest_len - len(str(key)))) + str(val)
-                        pass
-                is_first = False
+                    step = str(i)
+                yield step + ': ' + (' ' * (longest_len - len(step))) + str(count) + goal
+                # list the values that were detected for this bin
+                if self._step_size > 1 and i in self._hits.keys():
+                    yield from _hit_lines(self._hits[i])
             pass
         # print the number of bins that reached their goal
         else:
-            goals_reached = 0
-            for count in self._table_counts:
-                if count >= self._goal:
-                    goals_reached += 1
-                pass
-            result += str(goals_reached) + '/' + str(len(self._table_counts))
-        return result
\ No newline at end of file
+            yield str(self._points_met) + '/' + str(len(self._table_counts))
+
@@ -1,46 +1,77 @@
 import cocotb
-from io import StringIO
+import logging as _logging
+
+
+class _Message:
+    """
+    The values of a log message, which are only rendered into a string when the
+    record is emitted by a handler.
+    """
+
+    __slots__ = ('_values', '_sep', '_end')
+
+    def __init__(self, values: tuple, sep: str, end: str):
+        self._values = values
+        self._sep = sep
+        self._end = end
+
+    def __str__(self) -> str:
+        return self._sep.join([str(v) for v in self._values]) + self._end
+
+
+def _log(level: int, values: tuple, sep: str, end: str):
+    """
+    Logs the values at the `level` if the logger has that level enabled.
+    """
+    logger = cocotb.top._log
+    if logger.isEnabledFor(level) == True:
+        # report the location of the caller of the public logging function
+        logger.log(level, _Message(values, sep, end), stacklevel=3)
+
 
 def debug(*values: object, sep: str=' '):
     '''
     Logs the values with the DEBUG severity level.
     '''
-    s = StringIO()
-    print(*values, sep=sep, file=s, end='')
-    cocotb.top._log.debug(s.getvalue())
+    _log(_logging.DEBUG, values, sep, '')
 
 
 def info(*values: object, sep: str=' '):
     '''
     Logs the values with the INFO severity level.
     '''
-    s = StringIO()
-    print(*values, sep=sep, file=s)
-    cocotb.top._log.info(s.getvalue())
+    _log(_logging.INFO, values, sep, '\n')
 
 
 def warning(*values: object, sep: str=' '):
     '''
     Logs the values with the WARNING severity level.
     '''
-    s = StringIO()
-    print(*values, sep=sep, file=s)
-    cocotb.top._log.warning(s.getvalue())
+    _log(_logging.WARNING, values, sep, '\n')
 
 
 def error(*values: object, sep: str=' '):
     '''
     Logs the values with the ERROR severity level.
     '''
-    s = StringIO()
-    print(*values, sep=sep, file=s)
-    cocotb.top._log.error(s.getvalue())
+    _log(_logging.ERROR, values, sep, '\n')
 
 
 def critical(*values: object, sep: str=' '):
     '''
     Logs the values with the CRITICAL severity level.
     '''
-    s = StringIO()
-    print(*values, sep=sep, file=s)
-    cocotb.top._log.critical(s.getvalue())
+    _log(_logging.CRITICAL, values, sep, '\n')
+
+
+def emit(level: int, msg: str, *args: object, **fields: object):
+    '''
+    Logs the `msg` with the severity `level` without formatting it.
+
+    The `args` are passed through to the handler, which merges them into `msg`
+    using %-style formatting only if the record is emitted. Each keyword in
+    `fields` is attached to the log record as an attribute for structured handlers.
+    '''
+    logger = cocotb.top._log
+    if logger.isEnabledFor(level) == True:
+        logger.log(level, msg, *args, extra=fields, stacklevel=2)
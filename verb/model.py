@@ -37,12 +37,31 @@ class Strategy(_Enum):
 
 class Model(ABC):
 
-    def mirror(self):
+    # Port tables built by `mirror()` that map a mode to its ports
+    _port_table = None
+    _signal_table = None
+    # Failing coverage nets this model is allowed to drive
+    _net_table = None
+    _net_weights = None
+    _net_epoch = None
+    # Coverage nets sampled by this model, indexed by their priority sink
+    _sink_table = None
+    _sink_count = 0
+    _drop_passed = False
+    # Blocks of pre-drawn stimulus for each input port
+    _stimulus = None
+    # Buffer that combines the writes of this model's signals
+    _write_buffer = None
+
+    def mirror(self, lazy: bool=False):
         """
         Links signal objects to their simulation handles.
 
         This method should be called after all signal objects have been created within a model's
         `__init__` method.
+
+        Setting `lazy` to `True` defers reading each signal's initial value from the simulator
+        until the value is first used.
         """
         mdl_attrs = dir(self)
         top_sim_attrs = dir(cocotb.top)
@@ -54,24 +73,104 @@ class Model(ABC):
             generics = [g['name'] for g in dut_json['generics']]
         except:
             pass
+        port_modes = dict()
+        try:
+            port_modes = dict([(port['name'], port['mode']) for port in dut_json['ports']])
+        except:
+            pass
 
         for attr_name in mdl_attrs:
             mdl_attr = getattr(self, attr_name)
             # link the simulation handle to the signal object
             if isinstance(mdl_attr, Signal) and attr_name in top_sim_attrs:
-                mdl_attr.set_handle(getattr(cocotb.top, attr_name))
+                mdl_attr.set_handle(getattr(cocotb.top, attr_name), lazy=lazy)
             # use the json data to extract a type and it's constant value since unreliable for some simulators
             if isinstance(mdl_attr, Constant) and attr_name in generics:
                 dut_gen = dut_json['generics'][generics.index(attr_name)]
                 mdl_attr.set_value(dut_gen['default'], dut_gen['type'])
             # get the DUT information from environment variable to identify port directions
-            try:
-                for port in dut_json['ports']:
-                    port_name = port['name']
-                    if port_name == attr_name:
-                        mdl_attr._mode = port['mode']
-            except:
-                pass
+            if isinstance(mdl_attr, Signal) and attr_name in port_modes:
+                mdl_attr.set_mode(port_modes[attr_name])
+        # rebuild the port tables now that the signals are linked
+        self._compile_ports()
+
+    def invalidate_ports(self):
+        """
+        Discards the port tables built by `mirror()`.
+
+        This method should be called if a `Signal` attribute is added, removed, or changes
+        its mode after the model was mirrored. The tables are rebuilt the next time they
+        are needed.
+        """
+        self._port_table = None
+        self._signal_table = None
+        self._net_table = None
+        self._sink_table = None
+
+    def _compile_ports(self):
+        """
+        Builds the tables of (name, signal) tuples for each mode of port.
+
+        The `None` mode stores all signals.
+        """
+        ports = _extract_ports(self, mode=None)
+        table = {None: ports}
+        for (name, port) in ports:
+            if port.mode() is None:
+                continue
+            mode = Mode.from_str(port.mode())
+            if mode not in table:
+                table[mode] = []
+            table[mode] += [(name, port)]
+            pass
+        self._port_table = dict([(mode, tuple(entries)) for (mode, entries) in table.items()])
+        self._signal_table = dict([(mode, tuple([p[1] for p in entries])) for (mode, entries) in table.items()])
+        # route any newly found signals through the write buffer
+        if self._write_buffer is not None:
+            for (_, port) in ports:
+                port._set_buffer(self._write_buffer)
+
+    def combine_writes(self, enable: bool=True):
+        """
+        Enables or disables write-combining for the model's input ports.
+
+        When enabled, values assigned to input ports are held in a buffer instead of
+        being written to the simulator immediately. The buffer is flushed in one pass
+        right before the next `rising_edge`, `falling_edge`, or `wait` is awaited, and
+        only the last value assigned to each port is written.
+
+        Disabling write-combining flushes any pending writes.
+        """
+        from .signal import _WriteBuffer
+
+        if enable == True:
+            if self._write_buffer is None:
+                self._write_buffer = _WriteBuffer()
+        elif self._write_buffer is not None:
+            self._write_buffer.flush()
+            self._write_buffer = None
+        for port in self._get_signals(None):
+            port._set_buffer(self._write_buffer)
+
+    def _get_ports(self, mode: Mode=None) -> tuple:
+        """
+        Returns the (name, signal) tuples of the model's ports that match `mode`.
+
+        If `mode` is None, then returns all signals.
+        """
+        if self._port_table is None:
+            self._compile_ports()
+        return self._port_table.get(mode, ())
+
+    def _get_signals(self, mode: Mode=None) -> tuple:
+        """
+        Returns the signals of the model's ports that match `mode`.
+
+        If `mode` is None, then returns all signals.
+        """
+        if self._signal_table is None:
+            self._compile_ports()
+        return self._signal_table.get(mode, ())
 
     def randomize(self, strategy: str="weights"):
         """
@@ -96,126 +195,192 @@ class Model(ABC):
         - "uniform": sample a failing coverage net at random using uniform distribution and draw the next value to help close its coverage
         - "weights": sample a coverage net to advance according to its normalized weighted distribution of its distance from its goal
         """
-        from .coverage import Coverage
-        from .coverage.net import CoverageNet
-        from .signal import Signal, Mode
-        import random
-
-        net: CoverageNet
         port: Signal
 
-        strat: Strategy = Strategy.from_str(strategy)
-
-        ports = [p[1] for p in _extract_ports(self, mode=Mode.IN)]
-
         # always randomize all inputs no matter the strategy (default strategy)
-        for port in ports:
+        for port in self._get_signals(Mode.IN):
             port.sample()
             pass
+        self._advance_coverage(Strategy.from_str(strategy))
+
+    def randomize_batch(self, n: int=1024, strategy: str="weights"):
+        """
+        Assign random input values to each `Signal` attribute of the model instance that is
+        a known input port, drawing the values in blocks.
+
+        This function behaves like `randomize(...)`, except each input port's values are
+        drawn `n` at a time from its distribution and handed out one per call. The blocks
+        are drawn as vectorized batches when NumPy is installed, which reduces the cost of
+        long regressions.
+
+        ### Parameters
+        - `n`: number of values to draw for each input port at a time
+        - `strategy`: specify how to constrain the random input generation
+        """
+        port: Signal
+
+        if self._stimulus is None:
+            self._stimulus = dict()
+        for port in self._get_signals(Mode.IN):
+            block = self._stimulus.get(port)
+            # draw the next block once all values have been handed out
+            if block is None or block[1] >= len(block[0]):
+                block = [port.samples(n), 0]
+                self._stimulus[port] = block
+            port.value = block[0][block[1]]
+            block[1] += 1
+            pass
+        self._advance_coverage(Strategy.from_str(strategy))
+
+    def _advance_coverage(self, strat: Strategy):
+        """
+        Draws the next value of a failing coverage net that this model is allowed to drive,
+        chosen according to the strategy `strat`.
+        """
+        from .coverage.net import CoverageNet
+        import random
+
+        net: CoverageNet
 
         # use default provided distributions for each signal
         if strat == Strategy.NONE:
-            pass
+            return
+        # only work with failing coverage nets that are allowed to be auto-written by this model
+        candidates = self._get_drivable_nets()
+        if len(candidates) == 0:
+            return
         # go down list of each coverage net and draw a next value to help close coverage
-        elif strat == Strategy.LINEAR:
-            # collect the set of nets
-            failing_nets = Coverage.get_failing_nets()
-            # only work with coverage nets that deal with this model
-            for net in failing_nets:
-                # only work on coverage nets that are allowed to be auto-written
-                if net.has_source() == True:
-                    sources = net.get_source_list()
-                    # verify each writer exists in this current model
-                    for source in sources:
-                        if type(source) == Signal and source not in ports:
-                            break
-                    else:
-                        net.advance(rand=True)
-                    # exit- we only want to ensure we progress toward one coverage
-                    break
-                pass
-            pass
+        if strat == Strategy.LINEAR:
+            # we only want to ensure we progress toward one coverage
+            candidates[0].advance(rand=True)
         # select a coverage net at random using uniform distribution for next value to help close coverage
         elif strat == Strategy.UNIFORM:
-            candidates = []
-            # collect the set of nets
-            failing_nets = Coverage.get_failing_nets()
-            # only work with coverage nets that deal with this model
-            for net in failing_nets:
-                # only work on coverage nets that are allowed to be auto-written
-                if net.has_source() == True:
-                    sources = net.get_source_list()
-                    # verify each writer exists in this current model
-                    for source in sources:
-                        if type(source) == Signal and source not in ports:
-                            break
-                    else:
-                        candidates += [net]
-                    pass
-                pass
-            # choose a failing net at random
-            if len(candidates) > 0:
-                sel: CoverageNet = random.choice(candidates)
-                sel.advance(rand=True)
-                pass
-            pass
+            sel: CoverageNet = random.choice(candidates)
+            sel.advance(rand=True)
         # select a coverage net according to a weighted distribution using its distance to its goal
         elif strat == Strategy.WEIGHTS:
-            candidates = []
-            weights = []
-            # collect the set of nets
-            failing_nets = Coverage.get_failing_nets()
-            # only work with coverage nets that deal with this model
-            for net in failing_nets:
-                # only work on coverage nets that are allowed to be auto-written
-                if net.has_source() == True:
-                    sources = net.get_source_list()
-                    # verify each writer exists in this current model
-                    for source in sources:
-                        if type(source) == Signal and source not in ports:
-                            break
-                    else:
-                        candidates += [net]
-                        weights += [net.get_goal() - net.get_count()]
-                    pass
-                pass
-            # create the distribution weights for probability assignments
-            total_weight = 0
-            for i in weights: total_weight += i
-            weights = [w/total_weight for w in weights]
-            # choose a failing net at random
-            if len(candidates) > 0:
-                sel = random.choices(candidates, weights=weights)[0]
-                sel.advance(rand=True)
+            # refresh the live weights in place (relative weights need no normalizing)
+            weights = self._net_weights
+            for i, net in enumerate(candidates):
+                weights[i] = net.get_goal() - net.get_count()
+            sel = random.choices(candidates, weights=weights)[0]
+            sel.advance(rand=True)
         pass
 
-    def cover(self):
+    def _compile_nets(self):
+        """
+        Builds the list of failing coverage nets that this model is allowed to drive.
+
+        A net is drivable when it has a source and every signal in its source is an
+        input port of this model.
+        """
+        from .coverage.net import CoverageNet
+
+        inputs = set(self._get_signals(Mode.IN))
+        nets = []
+        net: CoverageNet
+        for net in CoverageNet._failing:
+            # only work on coverage nets that are allowed to be auto-written
+            if net.has_source() == False:
+                continue
+            # verify each writer exists in this current model
+            for source in net.get_source_list():
+                if isinstance(source, Signal) and source not in inputs:
+                    break
+            else:
+                nets += [net]
+            pass
+        self._net_table = nets
+        self._net_weights = [0] * len(nets)
+        self._net_epoch = CoverageNet._epoch
+
+    def _get_drivable_nets(self) -> list:
+        """
+        Returns the failing coverage nets that this model is allowed to drive.
+
+        The list is rebuilt only when nets are created or pass their goal.
+        """
+        from .coverage.net import CoverageNet
+
+        if self._net_table is None or self._net_epoch != CoverageNet._epoch:
+            self._compile_nets()
+        return self._net_table
+
+    def cover(self, drop_passed: bool=False):
         """
         Schedules a coroutine to run while the testcase is running to monitor when
         coverage nets are hit.
 
         This method should be called after all coverage nets have been created for a
         model.
+
+        Setting `drop_passed` to `True` stops sampling a coverage net once it has met its
+        goal, so its count will no longer grow past its goal.
         """
+        self._drop_passed = drop_passed
+        self._compile_nets()
+        self._compile_sinks()
         cocotb.start_soon(_monitor_coverage(self), name='cover')
 
+    def record(self, path: str='trace.vrb', block: int=8192, flush_seconds: float=1.0):
+        """
+        Schedules a coroutine to record the value of every port of the model at each
+        falling edge into a compact columnar trace file, and then returns the `Recorder`.
+
+        ### Parameters
+        - `path`: the file to write the trace to
+        - `block`: the number of cycles collected before they are written
+        - `flush_seconds`: the longest time collected cycles wait before being written
+
+        The values are sampled at the same time as the coverage monitor started by
+        `cover()`, so the trace can be replayed with `verb.replay(...)` to score the
+        coverage nets offline. The trace is closed by `verb.complete()`.
+        """
+        from .record import Recorder
+
+        recorder = Recorder(self, path, block=block, flush_seconds=flush_seconds)
+        cocotb.start_soon(recorder._run(), name='record')
+        return recorder
+
+    def _compile_sinks(self):
+        """
+        Builds the dispatch table that maps each signal of this model to the coverage
+        nets that use it as their priority sink.
+        """
+        from .coverage.net import CoverageNet
+
+        signals = set(self._get_signals(None))
+        table = dict()
+        net: CoverageNet
+        for net in CoverageNet._group:
+            if net.has_sink() == False or len(net.get_sink_list()) == 0:
+                continue
+            if self._drop_passed == True and net.passed() == True:
+                continue
+            # allow the first sink to have priority on check
+            pri_sink = net.get_sink_list()[0]
+            # perform observations only if the priority sink belongs to this model
+            if isinstance(pri_sink, Signal) and pri_sink in signals:
+                if pri_sink not in table:
+                    table[pri_sink] = []
+                table[pri_sink] += [net]
+            pass
+        self._sink_table = table
+        self._sink_count = len(CoverageNet._group)
+
     def get_inputs(self) -> _List[Signal]:
         """
         Returns the list of Signals that were detected as input ports for the design
         under test.
         """
-        from .signal import Mode
-        result = [p[1] for p in _extract_ports(self, mode=Mode.IN)]
-        return result
+        return list(self._get_signals(Mode.IN))
     
     def get_outputs(self) -> _List[Signal]:
         """
         Returns the list of Signals that were detected as output ports for the design
         under test.
         """
-        from .signal import Mode
-        result = [p[1] for p in _extract_ports(self, mode=Mode.OUT)]
-        return result
+        return list(self._get_signals(Mode.OUT))
 
 
 def _extract_ports(model, mode: Mode=None):
@@ -231,7 +396,7 @@ def _extract_ports(model, mode: Mode=None):
         if isinstance(getattr(model, attr_name), Signal) == True:
             mdl_signal: Signal = getattr(model, attr_name)
             # verify it matches the port direction
-            if mode is None or Mode.from_str(mdl_signal.mode()) == mode:
+            if mode is None or (mdl_signal.mode() is not None and Mode.from_str(mdl_signal.mode()) == mode):
                 # store tuple with (name, signal)
                 results += [(attr_name, mdl_signal)]
         pass
@@ -242,25 +407,22 @@ def _extract_ports(model, mode: Mode=None):
 
 async def _monitor_coverage(model):
     from .testbench import falling_edge
-    from .coverage import Coverage
     from .coverage.net import CoverageNet
-    from .signal import Signal
-
-    all_signals = [p[1] for p in _extract_ports(model, mode=None)]
 
     net: CoverageNet
     while True:
+        # rebuild the dispatch table if the ports or coverage nets have changed
+        if model._sink_table is None or model._sink_count != len(CoverageNet._group):
+            model._compile_sinks()
+        epoch = CoverageNet._epoch
         # check if there are coverages to automatically update
-        for net in Coverage.get_nets():
-            if net.has_sink() == True:
-                # verify the observation involves only signals being written for this transaction
-                sinks = net.get_sink_list()
-                # allow the first sink to have priority on check
-                pri_sink = sinks[0]
-                # perform an observation if the priority sink belongs to this model
-                if type(pri_sink) == Signal and pri_sink in all_signals:
-                    try:
-                        net.check(net.get_sink())
-                    except ValueError:
-                        pass
+        for nets in model._sink_table.values():
+            for net in nets:
+                try:
+                    net.check(net.get_sink())
+                except ValueError:
+                    pass
+        # stop sampling the nets that have met their goal
+        if model._drop_passed == True and epoch != CoverageNet._epoch:
+            model._compile_sinks()
         await falling_edge()
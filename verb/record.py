@@ -0,0 +1,344 @@
+"""
+Records the value of every port of a model each cycle into a compact columnar
+trace file, which can be memory-mapped and replayed through the coverage nets.
+
+A trace file starts with a magic string and a json header that lists each port's
+name, bit width, and the number of bytes used to store one of its values. The
+rest of the file is a sequence of blocks. Each block stores its row count and
+then one column per port, where each value is a little-endian unsigned integer
+packed into the port's number of bytes.
+"""
+
+import struct as _struct
+
+_MAGIC = b'VRBTRACE'
+_ROWS = _struct.Struct('<I')
+
+
+class Recorder:
+    """
+    Captures the values of a model's ports at every falling edge of the clock.
+
+    Values are collected into blocks of rows in memory. Full blocks are encoded and
+    written to the file by a background thread, which also flushes the rows
+    collected so far every `flush_seconds` so a long simulation keeps its trace up
+    to date on disk.
+    """
+
+    # Recorders that have not been closed yet
+    _open = []
+
+    def __init__(self, model, path: str, block: int=8192, flush_seconds: float=1.0):
+        """
+        Create a new `Recorder` object.
+
+        ### Parameters
+        - `model`: the model whose ports are recorded
+        - `path`: the file to write the trace to
+        - `block`: the number of rows collected before they are written
+        - `flush_seconds`: the longest time collected rows wait before being written
+        """
+        import json
+        import queue
+        import threading
+
+        self._ports = model._get_ports(None)
+        self._signals = [signal for (_, signal) in self._ports]
+        self._sizes = [_byte_count(signal) for signal in self._signals]
+        # the largest value each column can store
+        self._masks = [(1 << (8 * size)) - 1 for size in self._sizes]
+        self._block = block
+        self._flush_seconds = flush_seconds
+        self._rows = 0
+        self._columns = [[] for _ in self._signals]
+        self._flush_due = False
+        self._closed = False
+        # an error raised by the background thread
+        self._error = None
+
+        header = json.dumps({
+            'version': 1,
+            'ports': [{'name': name, 'width': _width(signal), 'bytes': size} for ((name, signal), size) in zip(self._ports, self._sizes)],
+        }).encode('utf-8')
+        self._fd = open(path, 'wb')
+        self._fd.write(_MAGIC + _ROWS.pack(len(header)) + header)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_blocks, name='verb-record', daemon=True)
+        self._thread.start()
+        Recorder._open += [self]
+
+    def sample(self):
+        """
+        Appends the current value of each port as a new row.
+
+        Values that cannot be resolved into an integer are recorded as 0, and
+        values that are negative or too wide for their column are masked to the
+        column's number of bytes.
+        """
+        for (column, signal, mask) in zip(self._columns, self._signals, self._masks):
+            try:
+                column += [int(signal.value) & mask]
+            except (ValueError, TypeError):
+                column += [0]
+            pass
+        self._rows += 1
+        if self._rows >= self._block or self._flush_due == True:
+            self.flush()
+
+    def flush(self):
+        """
+        Hands the rows collected so far to the background thread to be written.
+        """
+        self._flush_due = False
+        if self._error is not None:
+            raise self._error
+        if self._rows == 0:
+            return
+        self._queue.put((self._rows, self._columns))
+        self._rows = 0
+        self._columns = [[] for _ in self._signals]
+
+    def close(self):
+        """
+        Writes all collected rows, and then closes the trace file.
+        """
+        if self._closed == True:
+            return
+        self._closed = True
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._fd.close()
+        if self in Recorder._open:
+            Recorder._open.remove(self)
+        if self._error is not None:
+            raise self._error
+
+    @staticmethod
+    def close_all():
+        """
+        Closes every recorder that is still open.
+        """
+        for recorder in list(Recorder._open):
+            recorder.close()
+
+    async def _run(self):
+        from .testbench import falling_edge
+        while self._closed == False:
+            self.sample()
+            await falling_edge()
+
+    def _write_blocks(self):
+        """
+        Encodes and writes the blocks handed over by `flush()` until `close()`.
+        """
+        import queue
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_seconds)
+            except queue.Empty:
+                # ask the simulation to hand over the rows it collected so far
+                self._flush_due = True
+                continue
+            if item is None:
+                break
+            # drop the remaining blocks after a failure so the file ends on a whole block
+            if self._error is not None:
+                continue
+            (rows, columns) = item
+            try:
+                parts = [_ROWS.pack(rows)]
+                for (column, size) in zip(columns, self._sizes):
+                    parts += [_encode_column(column, size)]
+                self._fd.write(b''.join(parts))
+                self._fd.flush()
+            except Exception as e:
+                self._error = e
+        pass
+
+
+class Trace:
+    """
+    A trace file opened with a memory map, which provides each port's recorded
+    values as a column that can be sliced into NumPy arrays.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens the trace file at `path`.
+
+        A block left incomplete at the end of the file is ignored.
+        """
+        import json
+        import mmap
+
+        self._fd = open(path, 'rb')
+        self._map = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(_MAGIC)] != _MAGIC:
+            self.close()
+            raise Exception('file '+str(path)+' is not a verb trace')
+        (size,) = _ROWS.unpack_from(self._map, len(_MAGIC))
+        pos = len(_MAGIC) + _ROWS.size
+        header = json.loads(bytes(self._map[pos:pos+size]).decode('utf-8'))
+        self._ports = header['ports']
+        self._names = dict([(port['name'], i) for (i, port) in enumerate(self._ports)])
+        row_bytes = sum([port['bytes'] for port in self._ports])
+        # locate the start of each block's columns
+        self._blocks = []
+        self._starts = []
+        self._length = 0
+        pos += size
+        while pos + _ROWS.size <= len(self._map):
+            (rows,) = _ROWS.unpack_from(self._map, pos)
+            pos += _ROWS.size
+            if pos + rows * row_bytes > len(self._map):
+                break
+            offsets = []
+            for port in self._ports:
+                offsets += [pos]
+                pos += rows * port['bytes']
+            self._starts += [self._length]
+            self._blocks += [(rows, offsets)]
+            self._length += rows
+            pass
+
+    def __len__(self) -> int:
+        return self._length
+
+    def keys(self) -> list:
+        """
+        Returns the names of the recorded ports.
+        """
+        return list(self._names.keys())
+
+    def width(self, name: str) -> int:
+        """
+        Returns the bit width of the port `name`.
+        """
+        return self._ports[self._names[name]]['width']
+
+    def __getitem__(self, name: str):
+        return _Column(self, self._names[name])
+
+    def _read(self, block: int, port: int, lo: int, hi: int):
+        """
+        Returns the values of the `port` for the rows `lo` to `hi` of the `block`.
+        """
+        import numpy as np
+        (_, offsets) = self._blocks[block]
+        size = self._ports[port]['bytes']
+        start = offsets[port] + lo * size
+        if size in (1, 2, 4, 8):
+            return np.frombuffer(self._map, dtype='<u'+str(size), count=hi-lo, offset=start)
+        raw = self._map[start:start + (hi - lo) * size]
+        return np.array([int.from_bytes(raw[i:i+size], 'little') for i in range(0, len(raw), size)], dtype=object)
+
+    def close(self):
+        """
+        Closes the memory map and the trace file.
+        """
+        self._map.close()
+        self._fd.close()
+
+
+class _Column:
+    """
+    The recorded values of one port in a `Trace`.
+    """
+
+    def __init__(self, trace: Trace, port: int):
+        self._trace = trace
+        self._port = port
+
+    def __len__(self) -> int:
+        return len(self._trace)
+
+    def __getitem__(self, key):
+        """
+        Returns the values of a slice of rows as a NumPy array, or the value of a
+        single row as an integer.
+
+        A slice that lies within one block is a view into the memory map.
+        """
+        import bisect
+        import numpy as np
+
+        if isinstance(key, slice) == False:
+            key = int(key)
+            if key < 0:
+                key += len(self)
+            return int(self[key:key+1][0])
+        (lo, hi, step) = key.indices(len(self))
+        if step != 1:
+            return self[lo:hi][::step]
+        trace = self._trace
+        parts = []
+        block = max(bisect.bisect_right(trace._starts, lo) - 1, 0)
+        while lo < hi and block < len(trace._blocks):
+            start = trace._starts[block]
+            (rows, _) = trace._blocks[block]
+            end = min(hi, start + rows)
+            if end > lo:
+                parts += [trace._read(block, self._port, lo - start, end - start)]
+                lo = end
+            block += 1
+            pass
+        if len(parts) == 1:
+            return parts[0]
+        if len(parts) == 0:
+            return np.zeros(0, dtype=np.uint8)
+        return np.concatenate(parts)
+
+    def tolist(self) -> list:
+        return self[:].tolist()
+
+
+def read_trace(path: str) -> Trace:
+    """
+    Opens the trace file written by a `Recorder` with a memory map.
+    """
+    return Trace(path)
+
+
+def _width(signal) -> int:
+    """
+    Returns the bit width of the `signal`, or 64 if its width is unknown because it
+    is not linked to a simulator object and does not hold a `LogicArray`.
+    """
+    from .signal import Logics
+    if signal.get_handle() is None and signal._width is None and isinstance(signal.value, Logics) == False:
+        return 64
+    return signal.width()
+
+
+def _byte_count(signal) -> int:
+    """
+    Returns the number of bytes used to store one value of the `signal`.
+
+    Values up to 64 bits are packed into the smallest of 1, 2, 4, or 8 bytes so the
+    columns can be memory-mapped as NumPy arrays.
+    """
+    size = (_width(signal) + 7) // 8
+    for packed in (1, 2, 4, 8):
+        if size <= packed:
+            return packed
+    return size
+
+
+def _encode_column(column: list, size: int) -> bytes:
+    """
+    Encodes the integer values of the `column` into `size` bytes each.
+    """
+    import sys
+    from array import array
+
+    for typecode in ('B', 'H', 'I', 'L', 'Q'):
+        if array(typecode).itemsize == size:
+            try:
+                data = array(typecode, column)
+            except OverflowError:
+                raise Exception('recorded value does not fit in '+str(size)+' bytes')
+            if sys.byteorder == 'big':
+                data.byteswap()
+            return data.tobytes()
+    return b''.join([value.to_bytes(size, 'little') for value in column])
@@ -0,0 +1,190 @@
+"""
+Runs a testbench many times in parallel with distinct random seeds, and merges
+the coverage of the runs as they finish.
+"""
+
+
+def regress(command, runs: int=16, jobs: int=None, limit: int=None, threshold: float=1.0, seed: int=None, out_dir: str='regress', env: dict=None) -> dict:
+    """
+    Launches `runs` simulations of the `command`, with up to `jobs` simulations
+    running at a time, and then returns a summary of the regression.
+
+    ### Parameters
+    - `command`: the command that runs one simulation (a string is run by the shell)
+    - `runs`: the number of simulations to launch
+    - `jobs`: the number of simulations to run at a time (defaults to the core count)
+    - `limit`: the iteration limit of each simulation's `verb.running()` loop
+    - `threshold`: stop once the merged coverage meets this value [0, 1.0]
+    - `seed`: the first random seed, where each run adds its index (random if None)
+    - `out_dir`: the directory to write each run's results into
+    - `env`: additional environment variables for every simulation
+
+    Every run is given its own directory under `out_dir` for its log, its cocotb
+    build and results files, and its coverage report. The random seed is passed
+    through `COCOTB_RANDOM_SEED`, which cocotb uses to seed `random`, the iteration
+    limit through `VERB_LOOP_LIMIT`, and the coverage report path through
+    `VERB_COVERAGE_FILE`. Coverage files left in a run's directory by an earlier
+    regression are removed before the run starts, so a run that exits before saving
+    its coverage contributes nothing to the merged report.
+
+    The coverage of each run is merged as soon as the run finishes. Once the merged
+    coverage meets the `threshold` using the same rule as `verb.coverage.check`,
+    the simulations still running are terminated and the remaining runs are
+    skipped. The merged report is written to fcov.json in `out_dir`.
+    """
+    import os
+    import random
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from .coverage import merge as _merge
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if seed is None:
+        seed = random.getrandbits(32)
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    lock = threading.Lock()
+    stop = threading.Event()
+    procs = set()
+    merged = dict()
+    state = {'iterations': 0}
+
+    def launch(index: int) -> dict:
+        import subprocess
+        run_seed = (seed + index) & 0xFFFF_FFFF
+        result = {
+            'seed': run_seed,
+            'status': 'skipped',
+            'returncode': None,
+            'coverage': None,
+        }
+        if stop.is_set() == True:
+            return result
+        run_dir = os.path.join(out_dir, 'seed_' + str(run_seed))
+        os.makedirs(run_dir, exist_ok=True)
+        database = os.path.join(run_dir, 'fcov.json')
+        # only merge a database written by this run
+        for name in ('fcov.json', 'fcov.rpt', 'fcov.ckpt'):
+            stale = os.path.join(run_dir, name)
+            if os.path.exists(stale) == True:
+                os.remove(stale)
+            pass
+        run_env = dict(os.environ)
+        if env is not None:
+            run_env.update({str(k): str(v) for (k, v) in env.items()})
+        run_env.update({
+            'COCOTB_RANDOM_SEED': str(run_seed),
+            'VERB_COVERAGE_FILE': database,
+            'SIM_BUILD': os.path.join(run_dir, 'sim_build'),
+            'COCOTB_RESULTS_FILE': os.path.join(run_dir, 'results.xml'),
+        })
+        if limit is not None:
+            run_env['VERB_LOOP_LIMIT'] = str(limit)
+        with open(os.path.join(run_dir, 'run.log'), 'w') as log:
+            with lock:
+                if stop.is_set() == True:
+                    return result
+                # a new session lets an early stop reach every process the command spawns
+                proc = subprocess.Popen(command, shell=isinstance(command, str), env=run_env, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+                procs.add(proc)
+            returncode = proc.wait()
+        with lock:
+            procs.discard(proc)
+            result['returncode'] = returncode
+            if stop.is_set() == True and returncode != 0:
+                result['status'] = 'stopped'
+                return result
+            result['status'] = 'passed' if returncode == 0 else 'failed'
+            if os.path.exists(database) == False:
+                return result
+            result['coverage'] = database
+            state['iterations'] += _merge.merge_into(merged, database)
+            (met, total) = _merge.score(merged)
+            if total > 0 and float(met/total) >= threshold and stop.is_set() == False:
+                stop.set()
+                for other in procs:
+                    _terminate(other)
+                pass
+        return result
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(launch, range(runs)))
+
+    (met, total) = _merge.score(merged)
+    report = _merge.to_json(os.path.join(out_dir, 'fcov.json'), state['iterations'], merged)
+    return {
+        'runs': results,
+        'iterations': state['iterations'],
+        'count': met,
+        'points': total,
+        'score': round((met/total) * 100.0, 2) if total > 0 else None,
+        'covered': True if total <= 0 else float(met/total) >= threshold,
+        'report': report,
+    }
+
+
+def _terminate(proc):
+    """
+    Terminates the process `proc` along with the processes in its session, such
+    as a simulator launched by a shell or by `make`.
+    """
+    import os
+    import signal
+
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        pass
+    except AttributeError:
+        # process groups are not available on this platform
+        proc.terminate()
+    pass
+
+
+def main(argv=None) -> int:
+    """
+    Entry point of the `verb-regress` command-line tool.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='verb-regress',
+        description='Run a testbench across many random seeds in parallel and merge their coverage.',
+    )
+    parser.add_argument('-n', '--runs', type=int, default=16, help='number of simulations to launch')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of simulations to run at a time')
+    parser.add_argument('--limit', type=int, default=None, help='iteration limit of each simulation')
+    parser.add_argument('--threshold', type=float, default=1.0, help='stop once the merged coverage meets this value [0, 1.0]')
+    parser.add_argument('--seed', type=int, default=None, help='first random seed')
+    parser.add_argument('-o', '--out-dir', default='regress', help='directory to write the results into')
+    parser.add_argument('command', nargs='+', help='command that runs one simulation (place after --)')
+    args = parser.parse_args(argv)
+
+    summary = regress(
+        args.command,
+        runs=args.runs,
+        jobs=args.jobs,
+        limit=args.limit,
+        threshold=args.threshold,
+        seed=args.seed,
+        out_dir=args.out_dir,
+    )
+    failed = 0
+    for run in summary['runs']:
+        print('Seed ' + str(run['seed']) + ': ' + run['status'])
+        if run['status'] == 'failed':
+            failed += 1
+        pass
+    print('Iterations: ' + str(summary['iterations']))
+    print('Score: ' + str(summary['score']))
+    print('Count: ' + str(summary['count']))
+    print('Points: ' + str(summary['points']))
+    print('Report: ' + summary['report'])
+    return 0 if failed == 0 and summary['covered'] == True else 1
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
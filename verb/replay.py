@@ -0,0 +1,197 @@
+"""
+Scores coverage offline by replaying a recorded trace of a model's ports through
+the coverage nets, without running a simulator.
+"""
+
+
+def replay(model, trace, batch: int=65_536) -> int:
+    """
+    Replays the recorded values of the `model`'s ports through the coverage nets
+    that sample them, and then returns the number of cycles replayed.
+
+    ### Parameters
+    - `model`: the model whose signals are the sinks of the coverage nets
+    - `trace`: the recorded port values (see below)
+    - `batch`: the number of cycles evaluated at a time
+
+    The `trace` stores one column of integer values per port, where each row is
+    the value of the ports for one cycle. It can be a path to a trace file written
+    by `Model.record(...)` or to a .npy file of a structured array with one field
+    per port name (both are memory-mapped), a path to a .npz file of one array per
+    port name, a structured NumPy array, or a dictionary that maps port names to
+    arrays or lists.
+
+    Nets whose sinks are all recorded in the trace are checked with `check_many(...)`
+    one batch at a time. Nets with a custom checker function are checked one cycle
+    at a time after setting each sink's value to the recorded integer. The number of
+    cycles is added to the iteration count of the coverage report.
+    """
+    (length, columns, opened) = _open_trace(trace)
+    try:
+        _replay(model, length, columns, batch)
+    finally:
+        # drop the views into the trace before closing it
+        columns = None
+        if opened is not None:
+            _close_trace(opened)
+    return length
+
+
+def _replay(model, length: int, columns: dict, batch: int):
+    """
+    Replays the `length` rows of the `columns` through the coverage nets that
+    sample the `model`'s ports.
+    """
+    from .coverage.net import CoverageNet
+    from .signal import Signal
+
+    ports = dict([(signal, name) for (name, signal) in model._get_ports(None)])
+
+    batched = []
+    stepped = []
+    net: CoverageNet
+    for net in CoverageNet._group:
+        if net.has_sink() == False or len(net.get_sink_list()) == 0:
+            continue
+        signals = net.get_sink_list()
+        # every sink must be a recorded port of this model
+        if all([isinstance(s, Signal) and ports.get(s) in columns for s in signals]) == False:
+            continue
+        if _has_checker(net) == True:
+            stepped += [(net, signals, [ports[s] for s in signals])]
+        else:
+            sinks = net.get_sink()
+            is_list = isinstance(sinks, (list, tuple))
+            batched += [(net, [ports[s] for s in (sinks if is_list == True else [sinks])], is_list)]
+        pass
+
+    for lo in range(0, length, batch):
+        hi = min(lo + batch, length)
+        for (net, names, is_list) in batched:
+            if is_list == True:
+                net.check_many(_stack([columns[name][lo:hi] for name in names]))
+            else:
+                net.check_many(columns[names[0]][lo:hi])
+            pass
+        if len(stepped) > 0:
+            _step(stepped, columns, lo, hi)
+        pass
+    CoverageNet._counter += length
+
+
+def _step(nets: list, columns: dict, lo: int, hi: int):
+    """
+    Checks the `nets` one cycle at a time for the rows from `lo` to `hi`.
+
+    The value of each sink is restored afterward, so the model's signals are left
+    unchanged by the replay.
+    """
+    from .signal import _VALUE
+
+    chunks = dict()
+    for (_, _, names) in nets:
+        for name in names:
+            if name not in chunks:
+                chunk = columns[name][lo:hi]
+                chunks[name] = chunk.tolist() if hasattr(chunk, 'tolist') else list(chunk)
+            pass
+        pass
+    saved = dict([(signal, _VALUE.__get__(signal)) for (_, signals, _) in nets for signal in signals])
+    try:
+        for row in range(0, hi - lo):
+            for (net, signals, names) in nets:
+                for (signal, name) in zip(signals, names):
+                    # store directly to avoid driving a simulator
+                    _VALUE.__set__(signal, chunks[name][row])
+                try:
+                    net.check(net.get_sink())
+                except ValueError:
+                    pass
+                pass
+            pass
+    finally:
+        for (signal, value) in saved.items():
+            _VALUE.__set__(signal, value)
+        pass
+
+
+def _has_checker(net) -> bool:
+    """
+    Checks if the `net` maps its sink's value through a custom function, which
+    must be called on the sink's signals rather than a batch of values.
+    """
+    from .coverage.cross import CoverCross
+
+    if isinstance(net, CoverCross) == True:
+        # a cross maps its items through each crossed net, which may use a checker
+        if any([_has_checker(n) for n in net._nets]) == True:
+            return True
+        return any([isinstance(s, (list, tuple)) for s in net.get_sink()])
+    return getattr(net, '_fn_checker', None) != None or getattr(net, '_fn_cover', None) != None
+
+
+def _stack(chunks: list):
+    """
+    Combines the columns of a batch into a 2-dimensional array of one row per cycle.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return list(zip(*chunks))
+    return np.column_stack(chunks)
+
+
+def _open_trace(trace) -> tuple:
+    """
+    Opens the `trace` as a tuple of its number of cycles, a dictionary that maps
+    each port name to its column of values, and the trace file opened from a path
+    that must be closed by `_close_trace(...)` (None if `trace` was not a path).
+    """
+    import os
+
+    opened = None
+    if isinstance(trace, (str, os.PathLike)) == True:
+        import numpy as np
+        path = str(trace)
+        if path.endswith('.npz') == True:
+            trace = np.load(path)
+        elif path.endswith('.npy') == True:
+            trace = np.load(path, mmap_mode='r')
+        else:
+            from .record import read_trace, _MAGIC
+            with open(path, 'rb') as fd:
+                is_trace = fd.read(len(_MAGIC)) == _MAGIC
+            if is_trace == False:
+                raise Exception('unsupported trace file format: '+path)
+            trace = read_trace(path)
+        opened = trace
+    # a structured array stores each port as a field
+    names = getattr(getattr(trace, 'dtype', None), 'names', None)
+    if names is not None:
+        columns = dict([(name, trace[name]) for name in names])
+    else:
+        columns = dict([(str(name), trace[name]) for name in trace.keys()])
+    lengths = set([len(column) for column in columns.values()])
+    if len(lengths) > 1:
+        columns = None
+        if opened is not None:
+            _close_trace(opened)
+        raise Exception('trace columns have different lengths: '+str(sorted(lengths)))
+    return (lengths.pop() if len(lengths) > 0 else 0, columns, opened)
+
+
+def _close_trace(trace):
+    """
+    Closes a trace file opened by `_open_trace(...)`.
+
+    A memory-mapped .npy array has no close method, and its map is released once
+    the last reference to it is dropped.
+    """
+    if hasattr(trace, 'close') == False:
+        return
+    try:
+        trace.close()
+    except BufferError:
+        # a view is still referenced (such as by a traceback), which releases the map
+        pass
+    pass
@@ -76,68 +76,442 @@ class Dist:
         self._events_per_weight = 1
         # re-group the items
         self._partitioned_space = self._sample_space
-        # print(self._partition)
         if self._partition == True and type(self._weights) != type(None):
             self._partitioned_space = []
             self._events_per_weight = int(_math.ceil(len(self._sample_space) / len(weights)))
-            # initialize the bins
-            for i, element in enumerate(self._sample_space):
-                # group the items together based on a common index that divides them into groups
-                i_macro = int(i / self._events_per_weight)
-                #print(i_macro)
-                if len(self._partitioned_space) <= i_macro:
-                    self._partitioned_space.append([])
-                    pass
-                self._partitioned_space[i_macro] += [element]
+            # slicing keeps a range as a range instead of expanding its elements
+            elements = self._sample_space
+            if type(elements) != range and type(elements) != list:
+                elements = list(elements)
+            # group the items together based on a common index that divides them into groups
+            for i in range(0, len(elements), self._events_per_weight):
+                group = elements[i:i+self._events_per_weight]
+                self._partitioned_space += [group]
                 pass
+        # flatten the distribution into a table for constant-time draws
+        self._table = DistTable.compile(self._partitioned_space, self._weights)
         pass
 
+    @staticmethod
+    def from_table(table):
+        """
+        Creates a `Dist` that draws from a previously compiled `DistTable`.
+        """
+        dist = Dist.__new__(Dist)
+        dist._sample_space = None
+        dist._weights = None
+        dist._partition = False
+        dist._events_per_weight = 1
+        dist._partitioned_space = None
+        dist._table = table
+        return dist
+
+    def compile(self):
+        """
+        Returns the compiled `DistTable` that this distribution draws from.
+
+        The table can be pickled and later reused with `Dist.from_table(...)`.
+        """
+        return self._table
+
     def samples(self, k=1):
         """
         Produces a sample from the known distribution.
+
+        When drawing more than one sample and NumPy is installed, the samples are
+        drawn as a single vectorized batch.
+        """
+        if k == 1:
+            return [self._table.draw()]
+        return self._table.draws(k)
+    pass
+
+
+class DistTable:
+    """
+    The compiled form of a `Dist`.
+
+    The distribution is flattened into its leaves, where a leaf is either a single
+    value or a range of values, and each leaf's probability is stored in an alias
+    table built with Vose's method. Each draw costs constant time no matter how many
+    weights were given or how deeply the lists and ranges were nested.
+    """
+
+    def __init__(self, leaves: list, probs: list):
+        """
+        Create a new `DistTable` that picks `leaves[i]` with relative probability `probs[i]`.
+        """
+        if len(leaves) == 0 or sum(probs) <= 0:
+            raise Exception('Distribution has no values to sample')
+        self._leaves = leaves
+        # a range leaf is drawn from uniformly, while a value leaf has no size
+        self._sizes = [len(leaf) if type(leaf) == range else 0 for leaf in leaves]
+        self._prob, self._alias = _build_alias(probs)
+        self._vector = None
+
+    @staticmethod
+    def compile(space, weights=None):
+        """
+        Flattens the `space` into a table of its leaves.
+
+        Each element of `space` is chosen according to `weights` (uniform if None), and
+        any inner lists and ranges are unfolded by choosing one of their items uniformly.
+        Empty lists and ranges are never chosen.
+        """
+        leaves = []
+        probs = []
+        # an unweighted range is a single uniform leaf
+        if type(space) == range and weights is None:
+            _compile_leaves(space, 1.0, leaves, probs)
+            return DistTable(leaves, probs)
+        space = list(space)
+        if weights is None:
+            weights = [1.0] * len(space)
+        if len(weights) != len(space):
+            raise Exception('The number of weights ('+str(len(weights))+') does not match the number of elements ('+str(len(space))+')')
+        for (event, weight) in zip(space, weights):
+            if _is_empty(event) == False:
+                _compile_leaves(event, float(weight), leaves, probs)
+            pass
+        return DistTable(leaves, probs)
+
+    def draw(self):
+        """
+        Produces a single sample from the table.
         """
         import random as _random
 
-        outcomes = _random.choices(population=self._partitioned_space, weights=self._weights, k=k)
+        i = int(_random.random() * len(self._prob))
+        if _random.random() >= self._prob[i]:
+            i = self._alias[i]
+        if self._sizes[i] > 0:
+            return self._leaves[i][_random.randrange(self._sizes[i])]
+        return self._leaves[i]
+
+    def draws(self, k: int) -> list:
+        """
+        Produces `k` samples from the table.
+
+        The samples are drawn as a single vectorized batch when NumPy is installed.
+        """
+        rng = _generator()
+        if rng is None:
+            return [self.draw() for _ in range(k)]
+        import numpy as _np
+
+        if self._vector is None:
+            self._vector = self._vectorize()
+        (prob, alias, starts, steps, sizes) = self._vector
+        picks = rng.integers(0, len(prob), size=k)
+        picks = _np.where(rng.random(k) < prob[picks], picks, alias[picks])
+        # every leaf is an integer or range of integers
+        if starts is not None:
+            offsets = rng.integers(0, sizes[picks])
+            return (starts[picks] + steps[picks] * offsets).tolist()
         results = []
-        for event in outcomes:
-            # unfold inner lists and ranges
-            while type(event) == range or type(event) == list:
-                event = _random.choice(event)
-            results += [event]
+        for i in picks.tolist():
+            if self._sizes[i] > 0:
+                results += [self._leaves[i][int(rng.integers(0, self._sizes[i]))]]
+            else:
+                results += [self._leaves[i]]
         return results
+
+    def _vectorize(self) -> tuple:
+        """
+        Converts the table into NumPy arrays for batched draws.
+
+        The leaf arrays are `None` if any leaf cannot be stored as a 64-bit integer.
+        """
+        import numpy as _np
+
+        prob = _np.asarray(self._prob, dtype=float)
+        alias = _np.asarray(self._alias, dtype=_np.int64)
+        starts = []
+        steps = []
+        sizes = []
+        for (leaf, size) in zip(self._leaves, self._sizes):
+            if size > 0 and max(abs(leaf.start), abs(leaf.stop)) < _INT64_LIMIT:
+                starts += [leaf.start]
+                steps += [leaf.step]
+                sizes += [size]
+            elif size == 0 and type(leaf) == int and abs(leaf) < _INT64_LIMIT:
+                starts += [leaf]
+                steps += [0]
+                sizes += [1]
+            else:
+                return (prob, alias, None, None, None)
+            pass
+        return (prob, alias, _np.asarray(starts, dtype=_np.int64), _np.asarray(steps, dtype=_np.int64), _np.asarray(sizes, dtype=_np.int64))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the arrays are rebuilt on the next batched draw
+        state['_vector'] = None
+        return state
     pass
 
 
+def _is_empty(event) -> bool:
+    """
+    Checks if the `event` is a list or range that contains no values to sample.
+    """
+    if type(event) == range:
+        return len(event) == 0
+    if type(event) == list:
+        for inner in event:
+            if _is_empty(inner) == False:
+                return False
+        return True
+    return False
+
+
+def _compile_leaves(event, mass: float, leaves: list, probs: list):
+    """
+    Appends the leaves of `event` to `leaves`, splitting its probability `mass`
+    evenly among the items of any inner list.
+    """
+    if type(event) == list:
+        inner = [x for x in event if _is_empty(x) == False]
+        for x in inner:
+            _compile_leaves(x, mass / len(inner), leaves, probs)
+    elif type(event) == range:
+        if len(event) > 0:
+            leaves += [event]
+            probs += [mass]
+    else:
+        leaves += [event]
+        probs += [mass]
+
+
+def _build_alias(probs: list) -> tuple:
+    """
+    Builds the probability and alias tables for the relative probabilities `probs`
+    using Vose's method.
+    """
+    n = len(probs)
+    total = sum(probs)
+    scaled = [p * n / total for p in probs]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for (i, p) in enumerate(scaled) if p < 1.0]
+    large = [i for (i, p) in enumerate(scaled) if p >= 1.0]
+    while len(small) > 0 and len(large) > 0:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        # give the remaining probability of the small column to the large column
+        scaled[l] = (scaled[l] + scaled[s]) - 1.0
+        if scaled[l] < 1.0:
+            small += [l]
+        else:
+            large += [l]
+    # any leftover columns are full due to rounding
+    return (prob, alias)
+
+
+def _handle_width(handle: SimHandleBase) -> int:
+    """
+    Returns the number of bits of the simulator object, or `None` if the width
+    cannot be determined from its type.
+    """
+    import cocotb.handle as _handle
+    if isinstance(handle, _handle.LogicObject):
+        return 1
+    if isinstance(handle, (_handle.LogicArrayObject, getattr(_handle, 'PackedObject', _handle.LogicArrayObject))):
+        return len(handle)
+    return None
+
+
+def _snapshot(handle: SimHandleBase):
+    """
+    Returns a copy of the simulator object's current value.
+
+    Reading a simulator object's value builds a new object each time, so logic
+    values are stored as-is and only values of other types are deep copied.
+    """
+    value = handle.value
+    if isinstance(value, (Logic, Logics, int, float, str, bytes)):
+        return value
+    return copy.deepcopy(value)
+
+
+# Generator for batched sampling (created on first use)
+_rng = None
+
+# Largest magnitude that can be safely drawn as a 64-bit integer
+_INT64_LIMIT = 2**62
+
+
+def _generator():
+    """
+    Returns the NumPy random generator used for batched sampling, or `None` if
+    NumPy is not installed.
+
+    The generator is seeded from Python's `random` module so batched draws are
+    reproducible with the simulation's seed.
+    """
+    global _rng
+    if _rng is None:
+        try:
+            import numpy as _np
+        except ImportError:
+            return None
+        import random as _random
+        _rng = _np.random.default_rng(_random.getrandbits(64))
+    return _rng
+
+
+# Marks a value that has not yet been read from the simulator
+_UNREAD = object()
+
+
+class _WriteBuffer:
+    """
+    Collects the writes of signals to their simulator objects so the writes can
+    be applied together in one pass.
+
+    Only the last value written to each signal is kept.
+    """
+
+    # Class variable to track the buffers that have writes waiting to be flushed
+    _dirty = []
+
+    def __init__(self):
+        self._pending = dict()
+
+    def write(self, signal, value):
+        """
+        Stores the `value` to be written to the `signal`'s simulator object.
+        """
+        if len(self._pending) == 0:
+            _WriteBuffer._dirty += [self]
+        self._pending[signal] = value
+
+    def flush(self):
+        """
+        Writes all pending values to their simulator objects.
+        """
+        for (signal, value) in self._pending.items():
+            signal._handle.value = value
+        self._pending.clear()
+
+    @staticmethod
+    def flush_all():
+        """
+        Writes all pending values of every buffer to their simulator objects.
+        """
+        if len(_WriteBuffer._dirty) == 0:
+            return
+        for buffer in _WriteBuffer._dirty:
+            buffer.flush()
+        _WriteBuffer._dirty = []
+
+
 class Signal:
+
+    # the value is a plain slot, which is replaced by a descriptor only while the
+    # signal drives its simulator object or waits to read it (see `_relink()`)
+    __slots__ = ('value', '_handle', '_dist', '_width', '_max', '_span', '_mode', '_drive', '_buffer')
+
     def __init__(self, dist: Dist=None):
         self._handle: SimHandleBase = None
+        self._drive = None
+        self._buffer = None
+        # the width and bounds are computed once and kept until the width changes
+        self._width = None
+        self._max = None
+        self._span = None
         self.value: Logic = Logic(0)
         self._dist = dist
-        self._width = None
         self._mode = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # a subclass keeps its type, so its value always goes through the descriptor
+        if 'value' not in cls.__dict__:
+            cls.value = _Value()
+
     def mode(self) -> str:
         """
         Returns the mode of the port
         """
         return self._mode
+
+    def set_mode(self, mode: str):
+        """
+        Sets the mode of the port.
+        """
+        self._mode = mode
+        self._bind()
+
+    def _bind(self):
+        """
+        Binds how writes to the value reach the simulator.
+
+        Only a signal linked to the handle of an input port drives the simulator. If
+        the signal has a write buffer, its writes wait in the buffer until flushed.
+        """
+        if self._handle is not None and self._mode == 'in':
+            self._drive = self._write if self._buffer is None else self._defer
+        else:
+            self._drive = None
+        self._relink()
+
+    def _relink(self):
+        """
+        Switches the signal to the `_LazySignal` type until it reads its lazy snapshot,
+        to the `_DrivenSignal` type while it drives its simulator object, and to the
+        plain `Signal` type otherwise.
+        """
+        if type(self) not in (Signal, _DrivenSignal, _LazySignal):
+            return
+        if _VALUE.__get__(self) is _UNREAD:
+            self.__class__ = _LazySignal
+        elif self._drive is not None:
+            self.__class__ = _DrivenSignal
+        else:
+            self.__class__ = Signal
+
+    def _set_buffer(self, buffer: _WriteBuffer):
+        """
+        Sets the buffer that collects this signal's writes to the simulator.
+
+        Setting `buffer` to None writes directly to the simulator.
+        """
+        self._buffer = buffer
+        self._bind()
+
+    def _defer(self, value):
+        """
+        Stores the `value` in the write buffer until the buffer is flushed.
+        """
+        self._buffer.write(self, value)
+
+    def _write(self, value):
+        """
+        Writes the `value` to the simulator object.
+        """
+        self._handle.value = value
     
     def width(self) -> int:
         """
         Returns the width of the signal.
         """
-        if self._width is not None:
-            return self._width
-        try:
-            rg = self.value.range
-            self._width = 0
-            for _ in rg.to_range():
-                self._width += 1
-        except:
-            self._width = 1
+        value = self.value
+        # recompute the bounds once assigned a value of a different width
+        if self._width is None or (isinstance(value, Logics) and len(value) != self._width):
+            self._resize(len(value) if isinstance(value, Logics) else 1)
         return self._width
 
+    def _resize(self, width: int):
+        """
+        Stores the `width` of the signal along with the bounds it implies.
+        """
+        self._width = width
+        self._max = (1 << width) - 1
+        self._span = range(0, self._max + 1)
+
     def min(self) -> int:
         """
         Returns the minimum unsigned integer value this signal can represent.
@@ -148,7 +522,8 @@ class Signal:
         """
         Returns the maximum unsigned integer value this signal can represent.
         """
-        return (2**self.width())-1
+        self.width()
+        return self._max
 
     def span(self) -> range:
         """
@@ -156,7 +531,8 @@ class Signal:
         
         The start is inclusive and the end is exclusive.
         """
-        return range(self.min(), self.max()+1)
+        self.width()
+        return self._span
 
     def sample(self):
         """
@@ -172,17 +548,45 @@ class Signal:
         else:
             self.value = self._dist.samples(k=1)[0]
 
-    def set_handle(self, handle: SimHandleBase):
+    def samples(self, k: int) -> list:
+        """
+        Produces `k` random values based on its distribution without changing the
+        signal's value.
+
+        If no distribution was defined for the Signal, it will use a uniform
+        distribution across the possible allowed values. The values are drawn as a
+        single vectorized batch when NumPy is installed.
+        """
+        import random as _random
+        if self._dist != None:
+            return self._dist.samples(k=k)
+        rng = _generator()
+        if rng is not None and self.max() < _INT64_LIMIT:
+            return rng.integers(self.min(), self.max(), size=k, endpoint=True).tolist()
+        return [_random.randint(self.min(), self.max()) for _ in range(k)]
+
+    def set_handle(self, handle: SimHandleBase, lazy: bool=False):
         """
         Sets the simulator object for this signal.
+
+        The signal's value is set to a snapshot of the simulator object's current value.
+        If `lazy` is set to true, the snapshot is not taken until the value is first read.
         """
         self._handle: SimHandleBase = handle
-        if isinstance(self._handle.value, Logic):
-            self.value: Logic = copy.deepcopy(self._handle.value)
-        elif isinstance(self._handle.value, Logics):
-            self.value: Logics = copy.deepcopy(self._handle.value)
+        # read the width from the handle's type information rather than its value
+        width = _handle_width(handle)
+        if width is None:
+            self._width = None
+            self._max = None
+            self._span = None
+        else:
+            self._resize(width)
+        # store directly to avoid writing the snapshot back to the simulator
+        if lazy == True:
+            _VALUE.__set__(self, _UNREAD)
         else:
-            self.value = copy.deepcopy(self._handle.value)
+            _VALUE.__set__(self, _snapshot(handle))
+        self._bind()
 
     def get_handle(self) -> SimHandleBase:
         """
@@ -190,13 +594,75 @@ class Signal:
         """
         return self._handle   
 
-    def __setattr__(self, name, value):
-        if name == 'value' and self._handle is not None and self._mode == 'in':
-            self._handle.value = value       
-        super().__setattr__(name, value)
-
     def __int__(self) -> int:
         return int(self.value)
     
     def __str__(self) -> str:
         return str(self.value)
+
+
+# The plain slot storing a signal's value, which is read and written without
+# driving the simulator
+_VALUE = Signal.value
+
+
+class _Value:
+    """
+    The `value` attribute of a `_LazySignal` or of a subclass of `Signal`.
+
+    A read takes the snapshot of a lazily linked signal, and a write is forwarded
+    to the simulator by the signal's driver.
+    """
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = _VALUE.__get__(obj)
+        # take the snapshot on the first read of a lazily linked signal
+        if value is _UNREAD:
+            value = _snapshot(obj._handle)
+            _VALUE.__set__(obj, value)
+            obj._relink()
+        return value
+
+    def __set__(self, obj, value):
+        _VALUE.__set__(obj, value)
+        if obj._drive is not None:
+            obj._drive(value)
+        if type(obj) == _LazySignal:
+            # the snapshot is no longer needed once a value is written
+            obj._relink()
+        pass
+
+
+def _drive_value(obj, value):
+    """
+    Stores the `value` of a `_DrivenSignal` and forwards it to the simulator.
+    """
+    _VALUE.__set__(obj, value)
+    obj._drive(value)
+
+
+class _DrivenSignal(Signal):
+    """
+    A `Signal` of an input port that drives its simulator object when written.
+
+    Its value is read by the slot's own getter, so reads cost no more than a
+    property access.
+    """
+
+    __slots__ = ()
+
+    value = property(_VALUE.__get__, _drive_value)
+
+
+class _LazySignal(Signal):
+    """
+    A `Signal` that reads the snapshot of its simulator object when first read.
+
+    The signal switches to another type after its first read or write.
+    """
+
+    __slots__ = ()
+
+    value = _Value()
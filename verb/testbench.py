@@ -2,6 +2,11 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, Timer
 from cocotb.handle import SimHandleBase
+from .signal import Signal as _Signal
+from .signal import _WriteBuffer
+
+# Types whose value is read when compared in an assertion
+_VALUED = (SimHandleBase, _Signal)
 
 class Context:
 
@@ -68,8 +73,10 @@ def initialize(tb):
 
 
 def complete():
+    from .record import Recorder
     runner = Context.now()
     runner.finish()
+    Recorder.close_all()
     errors = runner.get_errors()
     assertions = runner.get_asserts()
     error_word = 'error' if errors == 1 else 'errors'
@@ -80,18 +87,41 @@ def complete():
 
 
 def assert_eq(recv, expt):
-    from .signal import Signal
+    """
+    Asserts that the received value `recv` equals the expected value `expt`.
+
+    Both values can be a `Signal`, a simulator object, or a plain value. The
+    error message is only formatted if the values are not equal.
+    """
     runner = Context.now()
-    
-    r_val = recv
-    e_val = expt
-    if isinstance(recv, SimHandleBase) or isinstance(recv, Signal):
-        r_val = recv.value
-    if isinstance(expt, SimHandleBase) or isinstance(expt, Signal):
-        e_val = expt.value
+    r_val = recv.value if isinstance(recv, _VALUED) else recv
+    e_val = expt.value if isinstance(expt, _VALUED) else expt
+    runner.asserts += 1
+    if (r_val == e_val) == False:
+        _report_mismatch(runner, recv, r_val, e_val)
+
 
-    is_eq = r_val == e_val
+def assert_eq_many(pairs):
+    """
+    Asserts that each received value equals its expected value for the iterable
+    of (received, expected) tuples in `pairs`.
 
+    This function behaves like calling `assert_eq(...)` on each pair.
+    """
+    runner = Context.now()
+    for (recv, expt) in pairs:
+        r_val = recv.value if isinstance(recv, _VALUED) else recv
+        e_val = expt.value if isinstance(expt, _VALUED) else expt
+        runner.asserts += 1
+        if (r_val == e_val) == False:
+            _report_mismatch(runner, recv, r_val, e_val)
+        pass
+
+
+def _report_mismatch(runner: Context, recv, r_val, e_val):
+    """
+    Logs the error for a failed assertion and counts it.
+    """
     try:
         r_str = str(int(r_val))
     except:
@@ -102,27 +132,18 @@ def assert_eq(recv, expt):
     except:
         e_str = str(e_val)
 
-    msg = ''
-    if is_eq == True:
-        msg = 'recevied '+r_str+' as expected'
-    else:
-        msg = 'received '+r_str+' but expects '+e_str
-    
     logger = cocotb.top._log
-    if isinstance(recv, Signal) and recv.get_handle() is not None:
+    if isinstance(recv, _Signal) and recv.get_handle() is not None:
         logger = recv.get_handle()._log
     if isinstance(recv, SimHandleBase):
         logger = recv._log
 
-    runner.inc_asserts()
-    if is_eq == False:
-        logger.error(msg)
-        runner.inc_error()
-    # else:
-    #     logger.info(msg)
+    logger.error('received '+r_str+' but expects '+e_str)
+    runner.inc_error()
 
 
 async def rising_edge(clk=None, cycles: int=1):
+    _flush_writes()
     if clk is None:
         clk = Context.now().get_clock().signal
     for _ in range(cycles):
@@ -130,6 +151,7 @@ async def rising_edge(clk=None, cycles: int=1):
 
 
 async def falling_edge(clk=None, cycles: int=1):
+    _flush_writes()
     if clk is None:
         clk = Context.now().get_clock().signal
     for _ in range(cycles):
@@ -137,4 +159,12 @@ async def falling_edge(clk=None, cycles: int=1):
 
 
 async def wait(time: float, unit: str='step'):
-    await Timer(time=time, unit=unit)
\ No newline at end of file
+    _flush_writes()
+    await Timer(time=time, unit=unit)
+
+
+def _flush_writes():
+    """
+    Writes the values held by models with write-combining enabled to the simulator.
+    """
+    _WriteBuffer.flush_all()
\ No newline at end of file